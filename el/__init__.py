@@ -1 +1 @@
-from el import config, core, db, models, skills, cli, llm
+from el import config, core, db, models, skills, cli, llm, bench
@@ -0,0 +1 @@
+from el.bench import harness, mock_ollama
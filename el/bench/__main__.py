@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from el.bench.harness import compare, load_corpus, run_benchmark
+from el.bench.mock_ollama import DEFAULT_RULES, MockOllama, load_rules
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m el.bench",
+        description="Replay a corpus through the agent against a mock Ollama",
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="only run the mock Ollama server (on --host/--port)",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11434)
+    parser.add_argument("--corpus", type=Path, help="one input per line")
+    parser.add_argument("--rules", type=Path, help="mock response rules (JSON)")
+    parser.add_argument("--iterations", type=int, default=1)
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="seconds to first token"
+    )
+    parser.add_argument(
+        "--token-latency", type=float, default=0.0, help="seconds per chunk"
+    )
+    parser.add_argument(
+        "--no-stream",
+        dest="stream",
+        action="store_false",
+        help="blocking replies, so every turn reports prompt eval",
+    )
+    parser.add_argument("--output", type=Path, help="write the JSON report here")
+    parser.add_argument("--baseline", type=Path, help="earlier JSON report")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="allowed relative slowdown against the baseline",
+    )
+    args = parser.parse_args()
+    rules = load_rules(args.rules) if args.rules else DEFAULT_RULES
+
+    if args.serve:
+        mock = MockOllama(
+            rules=rules,
+            latency=args.latency,
+            token_latency=args.token_latency,
+            host=args.host,
+            port=args.port,
+        )
+        print(f"Mock Ollama listening on {mock.url}", flush=True)
+        try:
+            mock.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        return
+
+    report = run_benchmark(
+        corpus=load_corpus(args.corpus),
+        iterations=args.iterations,
+        latency=args.latency,
+        token_latency=args.token_latency,
+        rules=rules,
+        stream=args.stream,
+    )
+    output = report.to_json()
+
+    if args.output:
+        args.output.write_text(output)
+    else:
+        print(output)
+
+    if args.baseline:
+        regressions = compare(
+            json.loads(output),
+            json.loads(args.baseline.read_text()),
+            args.tolerance,
+        )
+        for line in regressions:
+            print(f"regression: {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
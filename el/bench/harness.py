@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import json
+import tempfile
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from el.bench.mock_ollama import DEFAULT_RULES, MockOllama, MockRule
+from el.config.utils import percentile
+from el.core.agent import Agent
+
+DEFAULT_CORPUS: List[str] = [
+    "whoami",
+    "where am i",
+    "what is on port 8080",
+    "show my history",
+    "list the files in this directory",
+    "which user am I logged in as",
+    "df -h",
+    "free memory",
+    "tell me a joke",
+    "show the last 5 commands",
+    "first show the current directory then tell me who I am",
+]
+
+
+@dataclass(frozen=True)
+class TurnTiming:
+    input: str
+    success: bool
+    stages: Dict[str, float]
+    error: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class StageSummary:
+    count: int
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    max_ms: float
+
+
+@dataclass
+class BenchmarkReport:
+    """
+    Result of one benchmark run. Times are in milliseconds.
+    """
+
+    config: Dict[str, object]
+    turns: List[TurnTiming] = field(default_factory=list)
+    summary: Dict[str, StageSummary] = field(default_factory=dict)
+    maintenance_ms: float = 0.0
+    llm_requests: int = 0
+    prompt_eval: Dict[str, float] = field(default_factory=dict)
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), indent=2)
+
+
+def summarize(turns: Iterable[TurnTiming]) -> Dict[str, StageSummary]:
+    """
+    Per-stage distribution over the turns that went through the stage.
+    """
+    samples: Dict[str, List[float]] = defaultdict(list)
+    for turn in turns:
+        for stage, ms in turn.stages.items():
+            samples[stage].append(ms)
+
+    summary = {}
+    for stage, values in sorted(samples.items()):
+        values.sort()
+        summary[stage] = StageSummary(
+            count=len(values),
+            mean_ms=sum(values) / len(values),
+            p50_ms=percentile(values, 50),
+            p95_ms=percentile(values, 95),
+            max_ms=values[-1],
+        )
+    return summary
+
+
+def run_benchmark(
+    corpus: Sequence[str] = DEFAULT_CORPUS,
+    iterations: int = 1,
+    latency: float = 0.0,
+    token_latency: float = 0.0,
+    rules: Sequence[MockRule] = DEFAULT_RULES,
+    stream: bool = True,
+) -> BenchmarkReport:
+    """
+    Replay corpus through a fresh Agent backed by a MockOllama
+    server and collect per-stage timings for every turn.
+
+    The agent gets its own empty data directory, so the response
+    cache starts cold and repeated iterations show warm-cache turns.
+
+    prompt_eval totals the prompt tokens the mock evaluated and those
+    its simulated KV cache spared; streamed turns return before the
+    final chunk and are not in it, so run with stream=False to see
+    the prefix reuse of conversational calls.
+    """
+    report = BenchmarkReport(
+        config={
+            "corpus_size": len(corpus),
+            "iterations": iterations,
+            "latency": latency,
+            "token_latency": token_latency,
+            "stream": stream,
+        }
+    )
+
+    with MockOllama(
+        rules=rules, latency=latency, token_latency=token_latency
+    ) as mock, tempfile.TemporaryDirectory() as data_dir:
+        agent = Agent(base_urls=[mock.url], data_dir=Path(data_dir), stream=stream)
+        agent.warm_up()
+
+        try:
+            for _ in range(iterations):
+                for text in corpus:
+                    error = None
+                    try:
+                        success = agent.handle_input(text).success
+                    except Exception as e:
+                        success = False
+                        error = f"{type(e).__name__}: {e}"
+
+                    report.turns.append(
+                        TurnTiming(
+                            input=text,
+                            success=success,
+                            stages=agent.last_timings,
+                            error=error,
+                        )
+                    )
+
+            started = time.perf_counter()
+            agent.flush_maintenance()
+            report.maintenance_ms = (time.perf_counter() - started) * 1000
+
+            stats = agent.prompt_eval_stats
+            report.prompt_eval = {
+                "calls": stats.calls,
+                "evaluated_tokens": stats.evaluated_tokens,
+                "reused_tokens": stats.reused_tokens,
+                "eval_ms": stats.eval_ms,
+                "saved_ms": stats.saved_ms,
+            }
+        finally:
+            agent.close()
+
+        report.llm_requests = mock.requests
+
+    report.summary = summarize(report.turns)
+    return report
+
+
+def compare(
+    report: dict, baseline: dict, tolerance: float, stage: str = "total"
+) -> List[str]:
+    """
+    Regressions of report against a baseline (both as loaded from
+    to_json() output): percentiles that grew by more than tolerance.
+    """
+    regressions = []
+    current = report["summary"].get(stage)
+    previous = baseline["summary"].get(stage)
+    if current is None or previous is None:
+        return regressions
+
+    for key in ("p50_ms", "p95_ms"):
+        if previous[key] and current[key] > previous[key] * (1 + tolerance):
+            regressions.append(
+                f"{stage} {key}: {previous[key]:.2f} -> {current[key]:.2f}"
+            )
+    return regressions
+
+
+def load_corpus(path: Optional[Path]) -> List[str]:
+    """
+    One input per line; blank lines and #-comments are skipped.
+    """
+    if path is None:
+        return list(DEFAULT_CORPUS)
+
+    lines = (line.strip() for line in path.read_text().splitlines())
+    return [line for line in lines if line and not line.startswith("#")]
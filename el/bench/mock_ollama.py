@@ -0,0 +1,282 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, List, Optional, Sequence
+
+from el.llm.tokens import estimate_tokens
+
+_USER_INPUT = re.compile(r"User (?:input|request):\s*(.*?)\s*$", re.DOTALL)
+
+
+@dataclass(frozen=True)
+class MockRule:
+    """
+    Canned reply for prompts whose user input matches pattern.
+    """
+
+    pattern: re.Pattern
+    response: str
+
+    @classmethod
+    def from_dict(cls, data: dict) -> MockRule:
+        response = data["response"]
+        if not isinstance(response, str):
+            response = json.dumps(response)
+        return cls(re.compile(data["match"], re.IGNORECASE), response)
+
+
+DEFAULT_RULES: List[MockRule] = [
+    MockRule(
+        re.compile(r"\bport\s+(\d+)", re.IGNORECASE),
+        '{"action": "port", "port": 8080}',
+    ),
+    MockRule(
+        re.compile(r"\b(?:files|directory|folder)\b", re.IGNORECASE),
+        '{"action": "shell", "command": ["ls", "-la"]}',
+    ),
+    MockRule(
+        re.compile(r"\b(?:who|user)\b", re.IGNORECASE),
+        '{"action": "shell", "command": ["whoami"]}',
+    ),
+]
+
+_FACTS = '{"facts": []}'
+_PLAN = (
+    '{"goal": "mock plan", "steps": ['
+    '{"action": "shell", "command": ["pwd"]}, '
+    '{"action": "shell", "command": ["whoami"]}]}'
+)
+_NOOP = '{"action": "noop"}'
+_TEXT = "No durable facts."
+
+
+class MockOllama:
+    """
+    Stand-in Ollama server for benchmarks and offline development.
+
+    Responsibilities:
+    - Serve /api/generate (blocking or NDJSON streaming) and /api/version
+    - Answer from scripted rules, falling back to a reply shaped like
+      the requested output (facts, plan, request or plain text)
+    - Simulate model latency: time to first token plus per-chunk delay
+    - Report Ollama-style timing and token fields, evaluating only the
+      part of each prompt past what it shares with the previous one
+      (the way Ollama's KV cache reuses a common prefix)
+    """
+
+    def __init__(
+        self,
+        rules: Sequence[MockRule] = DEFAULT_RULES,
+        latency: float = 0.0,
+        token_latency: float = 0.0,
+        chunk_chars: int = 4,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        self._rules = list(rules)
+        self._latency = latency
+        self._token_latency = token_latency
+        self._chunk_chars = chunk_chars
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._cached_prompt = ""
+        self.requests = 0
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def serve_forever(self) -> None:
+        """
+        Serve in the calling thread until interrupted.
+        """
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+
+    def start(self) -> str:
+        """
+        Serve in a background thread.
+
+        Returns:
+            The server's base URL
+        """
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            name="el-mock-ollama",
+            daemon=True,
+        )
+        self._thread.start()
+        return self.url
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> MockOllama:
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def reply(self, payload: dict) -> str:
+        """
+        The canned response text for a /api/generate payload.
+        """
+        fmt = payload.get("format")
+        properties = fmt.get("properties", {}) if isinstance(fmt, dict) else {}
+
+        if "facts" in properties or '"facts"' in payload.get("prompt", ""):
+            return _FACTS
+        if "steps" in properties or "planner" in payload.get("system", ""):
+            return _PLAN
+        if fmt is None:
+            return _TEXT
+
+        match = _USER_INPUT.search(payload.get("prompt", ""))
+        user_input = match.group(1) if match else payload.get("prompt", "")
+
+        for rule in self._rules:
+            if rule.pattern.search(user_input):
+                return rule.response
+
+        return _NOOP
+
+    def _timings(self, payload: dict, response: str, elapsed: float) -> dict:
+        prompt = payload.get("system", "") + payload.get("prompt", "")
+        with self._lock:
+            cached = self._cached_prompt
+            self._cached_prompt = prompt
+        shared = len(os.path.commonprefix([cached, prompt]))
+        eval_ns = int(max(elapsed - self._latency, 0) * 1e9)
+
+        return {
+            "total_duration": int(elapsed * 1e9),
+            "load_duration": 0,
+            "prompt_eval_count": estimate_tokens(prompt[shared:]) or 1,
+            "prompt_eval_duration": int(self._latency * 1e9),
+            "eval_count": estimate_tokens(response),
+            "eval_duration": eval_ns or 1,
+        }
+
+    def _handler(self) -> type:
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+            def handle(self) -> None:
+                try:
+                    super().handle()
+                except (BrokenPipeError, ConnectionResetError):
+                    # Client went away mid-exchange (a hedged request's
+                    # loser, an early stream return): end quietly.
+                    self.close_connection = True
+
+            def do_GET(self) -> None:
+                if self.path == "/api/version":
+                    self._send_json({"version": "mock"})
+                else:
+                    self._send_json({"error": "not found"}, status=404)
+
+            def do_POST(self) -> None:
+                if self.path != "/api/generate":
+                    self._send_json({"error": "not found"}, status=404)
+                    return
+
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                with mock._lock:
+                    mock.requests += 1
+
+                started = time.perf_counter()
+                response = mock.reply(payload)
+                time.sleep(mock._latency)
+
+                if payload.get("stream", True):
+                    self._stream(payload, response, started)
+                    return
+
+                if mock._token_latency:
+                    chunks = -(-len(response) // mock._chunk_chars)
+                    time.sleep(mock._token_latency * chunks)
+
+                elapsed = time.perf_counter() - started
+                self._send_json(
+                    {
+                        "model": payload.get("model"),
+                        "response": response,
+                        "done": True,
+                        **mock._timings(payload, response, elapsed),
+                    }
+                )
+
+            def _stream(self, payload: dict, response: str, started: float) -> None:
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+
+                step = mock._chunk_chars
+                try:
+                    for i in range(0, len(response), step):
+                        self._write_chunk(
+                            {
+                                "model": payload.get("model"),
+                                "response": response[i : i + step],
+                                "done": False,
+                            }
+                        )
+                        time.sleep(mock._token_latency)
+
+                    elapsed = time.perf_counter() - started
+                    self._write_chunk(
+                        {
+                            "model": payload.get("model"),
+                            "response": "",
+                            "done": True,
+                            **mock._timings(payload, response, elapsed),
+                        }
+                    )
+                    self.wfile.write(b"0\r\n\r\n")
+                except (BrokenPipeError, ConnectionResetError):
+                    # Client stopped reading early (early stream return).
+                    self.close_connection = True
+
+            def _write_chunk(self, obj: dict) -> None:
+                line = json.dumps(obj).encode() + b"\n"
+                self.wfile.write(f"{len(line):x}\r\n".encode() + line + b"\r\n")
+                self.wfile.flush()
+
+            def _send_json(self, obj: dict, status: int = 200) -> None:
+                body = json.dumps(obj).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
+
+
+def load_rules(path: Path) -> List[MockRule]:
+    """
+    Read rules from a JSON file: [{"match": regex, "response": str|obj}].
+    """
+    return [MockRule.from_dict(d) for d in json.loads(path.read_text())]
+
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import argparse
 import sys
-from typing import List
+from typing import Callable, List, Optional
 
+from el.config.consts import HISTORY_MAX_LIMIT, HISTORY_RECORDS_LIMIT
+from el.config.utils import utc_isoformat
 from el.core.agent import Agent
 from el.core.executor import CommandResult
 
@@ -17,8 +20,13 @@ class CLI:
     - Render output to stdout/stderr
     """
 
-    def __init__(self) -> None:
-        self._agent = Agent()
+    def __init__(self, interactive: bool = True) -> None:
+        """
+        Args:
+            interactive: False for one-shot commands, which skip
+                background log retention
+        """
+        self._agent = Agent(auto_retention=interactive)
 
     def run(self, argv: List[str]) -> None:
         """
@@ -27,15 +35,50 @@ class CLI:
         Args:
             argv: sys.argv-style list
         """
+        try:
+            self._run(argv)
+        finally:
+            self._agent.close()
+
+    def _run(self, argv: List[str]) -> None:
         if len(argv) < 2:
             self._print_usage()
             sys.exit(1)
 
         if argv[1] == "history":
-            res = self._agent.get_history()
+            self._history(argv[2:])
+            return
+
+        if argv[1] == "llm-stats":
+            stats = self._agent.llm_stats()
+
+            if not stats:
+                print("No LLM calls recorded")
+            for s in stats:
+                tps = f"{s.tokens_per_sec:.1f}" if s.tokens_per_sec else "-"
+                print(
+                    f"{s.kind} | calls={s.calls} | failures={s.failures} | "
+                    f"p50={s.p50_ms:.0f}ms | p95={s.p95_ms:.0f}ms | "
+                    f"tokens/s={tps}"
+                )
+            return
+
+        if argv[1] == "command-stats":
+            stats = self._agent.command_stats()
 
-            for r in res.records:
-                print(f"{r.timestamp} | {r.command} | {r.return_code}")
+            if not stats:
+                print("No commands recorded")
+            for s in stats:
+                print(
+                    f"{s.binary} | runs={s.runs} | failures={s.failures} | "
+                    f"p50={s.p50_ms:.1f}ms | p95={s.p95_ms:.1f}ms | "
+                    f"p99={s.p99_ms:.1f}ms | cpu={s.mean_cpu_ms:.1f}ms | "
+                    f"peak_rss={s.peak_rss_kib // 1024}MiB"
+                )
+            return
+
+        if argv[1] == "maintenance":
+            self._maintenance(argv[2:])
             return
 
         if argv[1] == "port":
@@ -50,6 +93,86 @@ class CLI:
         result = self._agent.run_shell_command(command)
         self._render_result(result)
 
+    def _history(self, args: List[str]) -> None:
+        """
+        el history [TEXT...] [--since ISO] [--until ISO] [--code N]
+                   [--failed | --succeeded] [--binary NAME]
+                   [--limit N] [--before ID]
+        """
+        parser = argparse.ArgumentParser(prog="el history")
+        parser.add_argument("text", nargs="*", help="words in command or output")
+        parser.add_argument(
+            "--since", type=_timestamp, help="ISO date or time, UTC (inclusive)"
+        )
+        parser.add_argument(
+            "--until", type=_timestamp, help="ISO date or time, UTC (exclusive)"
+        )
+        parser.add_argument("--code", type=int, dest="return_code")
+        parser.add_argument("--failed", action="store_const", const=True, dest="failed")
+        parser.add_argument(
+            "--succeeded", action="store_const", const=False, dest="failed"
+        )
+        parser.add_argument("--binary", help="command name, e.g. ip")
+        parser.add_argument(
+            "--limit",
+            type=_int_between(1, HISTORY_MAX_LIMIT),
+            default=HISTORY_RECORDS_LIMIT,
+        )
+        parser.add_argument(
+            "--before", type=_int_between(1), help="cursor from a previous page"
+        )
+        opts = parser.parse_args(args)
+
+        res = self._agent.get_history(
+            limit=opts.limit,
+            text=" ".join(opts.text) or None,
+            since=opts.since,
+            until=opts.until,
+            return_code=opts.return_code,
+            failed=opts.failed,
+            binary=opts.binary,
+            before=opts.before,
+        )
+
+        for r in res.records:
+            print(f"{r.timestamp} | {r.command} | {r.return_code}")
+        if res.next_cursor is not None:
+            print(f"-- more: --before {res.next_cursor}")
+
+    def _maintenance(self, args: List[str]) -> None:
+        """
+        el maintenance [--max-age-days N] [--max-rows N] [--max-bytes N]
+                       [--no-archive]
+        """
+        parser = argparse.ArgumentParser(prog="el maintenance")
+        parser.add_argument("--max-age-days", type=float)
+        parser.add_argument("--max-rows", type=int)
+        parser.add_argument("--max-bytes", type=int)
+        parser.add_argument(
+            "--no-archive", action="store_true", help="delete without archiving"
+        )
+        opts = parser.parse_args(args)
+
+        limits = {}
+        if opts.max_age_days is not None:
+            limits["max_age"] = opts.max_age_days * 24 * 60 * 60
+        if opts.max_rows is not None:
+            limits["max_rows"] = opts.max_rows
+        if opts.max_bytes is not None:
+            limits["max_bytes"] = opts.max_bytes
+        if opts.no_archive:
+            limits["archive_dir"] = None
+
+        report = self._agent.maintain_log(**limits)
+
+        print(
+            f"archived={report.archived} | deleted={report.deleted} | "
+            f"blobs_deleted={report.blobs_deleted}"
+        )
+        print(f"size: {report.bytes_before} -> {report.bytes_after} bytes")
+        for path in report.archives:
+            print(f"archive: {path}")
+
     def _render_result(self, result: CommandResult) -> None:
         """
         Render CommandResult to the console.
@@ -66,6 +189,13 @@ class CLI:
             print("Command timed out", file=sys.stderr)
 
     def converse(self):
+        try:
+            self._agent.warm_up()
+            self._converse()
+        finally:
+            self._agent.close()
+
+    def _converse(self):
         while True:
             try:
                 text = input("el> ").strip()
@@ -116,3 +246,34 @@ class CLI:
     @staticmethod
     def _print_usage() -> None:
         print("Usage: el <command> [args...]")
+        print("       el history [text] [--failed] [--binary B] ... | port <port>")
+        print("       el llm-stats | command-stats")
+        print("       el maintenance [--max-age-days N] ...")
+
+
+def _int_between(low: int, high: Optional[int] = None) -> Callable[[str], int]:
+    """
+    argparse type for an integer in [low, high].
+    """
+
+    def parse(value: str) -> int:
+        try:
+            number = int(value)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid integer: {value!r}")
+        if number < low or (high is not None and number > high):
+            bounds = f"between {low} and {high}" if high is not None else f">= {low}"
+            raise argparse.ArgumentTypeError(f"must be {bounds}, got {number}")
+        return number
+
+    return parse
+
+
+def _timestamp(value: str) -> str:
+    """
+    argparse type for an ISO date or timestamp, normalized to UTC.
+    """
+    try:
+        return utc_isoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid ISO timestamp: {value!r}")
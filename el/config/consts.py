@@ -1,10 +1,56 @@
 LOG_FILE: str = ".el_execution_log.db"
+LLM_CACHE_FILE: str = ".el_llm_cache.db"
+MEMORY_FILE: str = ".el_memory.db"
 
 HISTORY_RECORDS_LIMIT: int = 10
+HISTORY_MAX_LIMIT: int = 100
 MIN_MEMORY_IMPORTANCE: int = 2
+MEMORY_BATCH_SIZE: int = 8
+MEMORY_LOAD_WINDOW: int = 200
+MEMORY_WRITE_BATCH: int = 64
+LOG_WRITE_BATCH: int = 64
+LOG_COMPRESS_MIN_BYTES: int = 512
+LOG_FTS_MAX_CHARS: int = 32_768
+LOG_ARCHIVE_DIR: str = ".el_log_archive"
+LOG_MAX_AGE: float = 90 * 24 * 60 * 60
+LOG_MAX_ROWS: int = 1_000_000
+LOG_MAX_BYTES: int = 512 * 1024 * 1024
+LOG_RETENTION_INTERVAL: float = 60 * 60
+LOG_RETENTION_CHUNK: int = 1000
+LOG_VACUUM_PAGES: int = 1024
+LOG_STATS_WINDOW: int = 10_000
+MEMORY_MAX_RECORDS: int = 2000
+MEMORY_HALF_LIFE: float = 7 * 24 * 60 * 60
+FACT_SIMILARITY_THRESHOLD: float = 0.8
+SUMMARY_MIN_COMMANDS: int = 10
+SUMMARY_MIN_AGE: float = 600.0
+ROUTER_CONFIDENCE_THRESHOLD: float = 0.9
+PROMPT_TOKEN_BUDGET: int = 1024
+PROMPT_RELEVANT_RECORDS: int = 8
+PROMPT_RECENT_RECORDS: int = 3
+CONFIRMATION_TTL: float = 120.0
 LLM_MODEL: str = "llama3.1"
 BASE_URL: str = "http://localhost:11434"
+LLM_BASE_URLS: list[str] = [BASE_URL]
+LLM_HEALTH_INTERVAL: float = 30.0
+LLM_HEALTH_TIMEOUT: float = 2.0
+LLM_BACKEND_RETRY_AFTER: float = 15.0
+LLM_HEDGE_AFTER: float | None = None
 LLM_TIMEOUT: int = 60 * 60
+LLM_MAX_CONNECTIONS: int = 10
+LLM_MAX_KEEPALIVE_CONNECTIONS: int = 5
+LLM_KEEPALIVE_EXPIRY: float = 300.0
+LLM_STREAM: bool = True
+LLM_STRUCTURED_OUTPUT: bool = True
+LLM_KEEP_ALIVE: str = "30m"
+CHARS_PER_TOKEN: int = 4
+LLM_CACHE_MEMORY_ENTRIES: int = 256
+LLM_CACHE_DISK_ENTRIES: int = 10_000
+LLM_CACHE_TTL: int = 7 * 24 * 60 * 60
+LLM_CACHE_EVICT_INTERVAL: int = 100  # disk inserts between pruning runs
+LLM_TELEMETRY_WINDOW: int = 1000
+LLM_TELEMETRY_MAX_ROWS: int = 10_000
+LLM_TELEMETRY_PRUNE_INTERVAL: int = 100  # rows written between pruning runs
 
 ALLOWED_COMMANDS = {
     "ls",
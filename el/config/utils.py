@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import math
+from datetime import datetime, timezone
+from typing import Sequence
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """
+    Nearest-rank percentile of already sorted values.
+    """
+    if not values:
+        return 0.0
+    rank = max(1, math.ceil(q / 100 * len(values)))
+    return values[rank - 1]
+
+
+def utc_isoformat(value: str) -> str:
+    """
+    An ISO 8601 date or timestamp as the naive UTC isoformat() the
+    logs store. Timestamps without an offset are taken as UTC.
+
+    Raises:
+        ValueError: value is not an ISO date or timestamp
+    """
+    moment = datetime.fromisoformat(value.strip())
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return moment.isoformat()
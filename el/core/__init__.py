@@ -1 +1,11 @@
-from el.core import agent, dispatcher, executor, planner
+from el.core import (
+    agent,
+    context,
+    dispatcher,
+    executor,
+    maintenance,
+    pending,
+    planner,
+    router,
+    timing,
+)
@@ -1,32 +1,53 @@
 from __future__ import annotations
 
+import asyncio
+import threading
+import time
+from dataclasses import replace
 from pathlib import Path
-from typing import List
-from datetime import datetime
+from typing import Dict, List, Optional, Sequence
 
+from el.core.context import AssembledPrompt, PromptAssembler
 from el.core.dispatcher import Dispatcher
 from el.core.executor import ExecutionPolicy, Executor, CommandResult
+from el.core.maintenance import MemoryMaintainer
+from el.core.pending import Decision, PendingActions
 from el.config.consts import (
     ALLOWED_COMMANDS,
     DESTRUCTIVE_COMMANDS,
     HISTORY_RECORDS_LIMIT,
+    LLM_BASE_URLS,
+    LLM_CACHE_FILE,
+    LLM_STREAM,
+    LLM_TELEMETRY_WINDOW,
+    LOG_ARCHIVE_DIR,
     LOG_FILE,
+    LOG_STATS_WINDOW,
+    MEMORY_FILE,
     MIN_MEMORY_IMPORTANCE,
+    PROMPT_RECENT_RECORDS,
+    PROMPT_RELEVANT_RECORDS,
 )
 from el.core.planner import Plan, Planner
+from el.core.router import IntentRouter, RouterStats
+from el.core.timing import StageTimer
 from el.db.memory import (
     MemoryImportance,
     MemoryKind,
     MemoryRecord,
-    MemoryStore,
     MemoryTTL,
+    SQLiteMemoryStore,
 )
-from el.db.sqlite import SQLiteExecutionLogger
-from el.llm.client import LLMClient, LLMError
-from el.llm.prompts import SUMMARY_PROMPT
+from el.db.retention import RetentionPolicy, RetentionReport
+from el.db.sqlite import CommandUsageSummary, SQLiteExecutionLogger
+from el.llm.cache import ResponseCache
+from el.llm.client import AsyncLLMClient, LLMClient, LLMError
+from el.llm.pool import BackendPool
 from el.llm.schemas import LLMRequest, NoOpRequest
+from el.llm.telemetry import LLMCallSummary, LLMTelemetry
+from el.llm.tokens import PromptEvalStats
 from el.models.request import HistoryRequest, PortInspectRequest, ShellRequest
-from el.models.response import AgentResponse, PlanResult
+from el.models.response import AgentResponse, PlanResult, ShellResponse
 
 
 class Agent:
@@ -39,21 +60,132 @@ class Agent:
     - Delegate to dispatcher
     - Return structured output
 
-    This layer will later integrate with the LLM.
+    The conversational pipeline is asyncio-based (handle_input_async);
+    handle_input is a thin synchronous wrapper over it.
     """
 
-    def __init__(self, policy: ExecutionPolicy | None = None) -> None:
+    def __init__(
+        self,
+        policy: ExecutionPolicy | None = None,
+        base_urls: Sequence[str] = LLM_BASE_URLS,
+        data_dir: Optional[Path] = None,
+        auto_retention: bool = True,
+        stream: bool = LLM_STREAM,
+    ) -> None:
+        """
+        Args:
+            base_urls: Ollama backends to use
+            data_dir: Where the agent's databases live (home by default)
+            auto_retention: Enforce log retention in the background;
+                off for one-shot commands, which should exit promptly
+            stream: Stream conversational replies; streamed calls return
+                before Ollama's final chunk, so they report no prompt eval
+        """
         if policy is None:
             policy = ExecutionPolicy(
                 allowed_commands=ALLOWED_COMMANDS,
                 working_directory=Path.home(),
             )
+        if data_dir is None:
+            data_dir = Path.home()
         self._executor = Executor(policy)
-        self._dispatcher = Dispatcher(self._executor)
-        self._llm = LLMClient()
-        self._memory = MemoryStore()
+        self._retention = RetentionPolicy(archive_dir=data_dir / LOG_ARCHIVE_DIR)
+        self._logger = SQLiteExecutionLogger(
+            db_path=data_dir / LOG_FILE,
+            retention=self._retention if auto_retention else None,
+        )
+        self._dispatcher = Dispatcher(self._executor, logger=self._logger)
+        self._router = IntentRouter(allowed_commands=policy.allowed_commands)
+        self._assembler = PromptAssembler(self._dispatcher.capabilities())
+        self._cache = ResponseCache(db_path=data_dir / LLM_CACHE_FILE)
+        self._telemetry = LLMTelemetry(db_path=data_dir / LOG_FILE)
+        self._backends = BackendPool(base_urls)
+        if len(self._backends) > 1:
+            self._backends.start()
+        self._loop = asyncio.new_event_loop()
+        # Shared, so the warm-up's cold prefix cost is the baseline
+        # for the interactive client's reuse figures.
+        self._prompt_eval = PromptEvalStats()
+        self._llm = AsyncLLMClient(
+            cache=self._cache,
+            pool=self._backends,
+            telemetry=self._telemetry,
+            prompt_eval=self._prompt_eval,
+            stream=stream,
+        )
+        self._memory = SQLiteMemoryStore(db_path=data_dir / MEMORY_FILE)
         self._planner = Planner(self._llm)
-        self._logger = SQLiteExecutionLogger(db_path=Path.home() / LOG_FILE)
+        self._maintenance_llm = LLMClient(
+            cache=self._cache,
+            pool=self._backends,
+            telemetry=self._telemetry,
+            prompt_eval=self._prompt_eval,
+        )
+        self._maintainer = MemoryMaintainer(self._maintenance_llm, self._memory)
+        self._timer = StageTimer()
+        self._pending = PendingActions()
+        self._last_timings: Dict[str, float] = {}
+
+    def warm_up(self) -> None:
+        """
+        Load the model and evaluate the static prompt prefix in the
+        background so the first turn does not pay for it.
+
+        Only worth it before a conversation: the model stays loaded
+        for keep_alive, so one-shot commands should not call this.
+        """
+        threading.Thread(
+            target=self._maintenance_llm.warm,
+            args=(self._assembler.prefix,),
+            name="el-warm-up",
+            daemon=True,
+        ).start()
+
+    @property
+    def router_stats(self) -> RouterStats:
+        """
+        Per-route fast-path hits (LLM calls saved) and misses.
+        """
+        return self._router.stats
+
+    @property
+    def prompt_eval_stats(self) -> PromptEvalStats:
+        """
+        Prompt-eval work done and saved by prefix reuse, in Ollama's
+        token counts (last holds the most recent call).
+        """
+        return self._prompt_eval
+
+    @property
+    def last_timings(self) -> Dict[str, float]:
+        """
+        Milliseconds spent per stage (memory, route, llm, dispatch,
+        logging) in the most recent turn, plus its total.
+        """
+        return self._last_timings
+
+    def flush_maintenance(self) -> None:
+        """
+        Block until background memory maintenance has caught up.
+        """
+        self._maintainer.flush()
+
+    def close(self) -> None:
+        """
+        Release resources held by the agent (maintenance worker,
+        memory, log and telemetry writers, LLM connection pools,
+        backend health checks, response cache).
+        """
+        self._maintainer.close()
+        self._memory.close()
+        self._logger.close()
+        self._telemetry.close()
+        self._maintenance_llm.close()
+        self._loop.run_until_complete(self._llm.aclose())
+        self._loop.run_until_complete(self._loop.shutdown_asyncgens())
+        self._loop.close()
+        self._backends.close()
+        self._cache.close()
 
     def run_shell_command(self, command: List[str]):
         """
@@ -71,47 +203,98 @@ class Agent:
 
         return result
 
-    def get_history(self, limit: int = HISTORY_RECORDS_LIMIT):
-        return self._dispatcher.dispatch(HistoryRequest(limit=limit))
+    def get_history(self, limit: int = HISTORY_RECORDS_LIMIT, **filters):
+        """
+        Execution history, newest first.
+
+        Args:
+            filters: HistoryRequest filters (text, since, until,
+                return_code, failed, binary, before)
+        """
+        return self._dispatcher.dispatch(HistoryRequest(limit=limit, **filters))
+
+    def maintain_log(self, **limits) -> RetentionReport:
+        """
+        Enforce execution log retention now, after trimming the LLM
+        call telemetry that shares the log database, so the space it
+        frees is reclaimed too.
+
+        Args:
+            limits: RetentionPolicy fields overriding the agent's
+                policy (max_age, max_rows, max_bytes, archive_dir)
+        """
+        self._telemetry.prune()
+        return self._logger.enforce_retention(replace(self._retention, **limits))
 
     def inspect_port(self, port: int):
         return self._dispatcher.dispatch(PortInspectRequest(port=port))
 
+    def llm_stats(self, window: int = LLM_TELEMETRY_WINDOW) -> List[LLMCallSummary]:
+        """
+        Latency percentiles and tokens/sec per LLM call kind.
+        """
+        return self._telemetry.summary(window)
+
+    def command_stats(
+        self, window: int = LOG_STATS_WINDOW
+    ) -> List[CommandUsageSummary]:
+        """
+        Duration percentiles, CPU time and peak memory per binary.
+        """
+        return self._logger.usage_summary(window)
+
     def handle_input(self, text: str):
         """
         Conversational entrypoint.
         """
+        return self._loop.run_until_complete(self.handle_input_async(text))
 
-        last = self._memory.all()[-1] if self._memory.all() else None
+    async def handle_input_async(self, text: str):
+        """
+        Asynchronous conversational entrypoint.
 
-        if last and last.output == "confirmation_required":
-            if text.lower() in {"yes", "y"}:
-                request = self._llm.generate(
-                    user_input=last.input,
-                    schema=LLMRequest,
-                    context=self._build_capability_context(),
-                )
-            else:
-                return AgentResponse(success=True, message="Cancelled.")
+        Blocking work (command execution, SQLite) runs in worker
+        threads. Fact extraction and summarization are handed to the
+        background maintainer, so the result returns as soon as the
+        command finishes.
 
-        capabilities = self._build_capability_context()
-        memory_context = self._memory_context()
+        Time spent per stage is available as last_timings afterwards.
+        """
+        self._timer.reset()
+        try:
+            return await self._handle_input(text)
+        finally:
+            self._last_timings = self._timer.snapshot()
 
-        context = f"""
-Capabilities:
-{capabilities}
+    async def _handle_input(self, text: str):
+        timer = self._timer
 
-Recent memory:
-{memory_context}
-        """
+        decision, pending = self._pending.resolve(text)
 
-        if self._wants_multistep(text):
-            plan = self._planner.generate_plan(
-                user_input=text,
-                context=context,
+        if decision is Decision.CANCELLED:
+            return AgentResponse(success=True, message="Cancelled.")
+
+        if decision is Decision.EXPIRED:
+            return AgentResponse(
+                success=False,
+                message="Confirmation expired. Please ask again.",
             )
 
-            results, failed = self._execute_plan(plan)
+        confirmed = decision is Decision.CONFIRMED
+        if confirmed:
+            text = pending.input
+        elif self._wants_multistep(text):
+            with timer.stage("memory"):
+                prompt = self._assemble_prompt(text)
+
+            with timer.stage("llm"):
+                plan = await self._planner.generate_plan_async(
+                    user_input=text,
+                    context=f"{prompt.prefix}\n\n{prompt.context}",
+                )
+
+            with timer.stage("dispatch"):
+                results, failed = await asyncio.to_thread(self._execute_plan, plan)
 
             return AgentResponse(
                 success=not failed,
@@ -125,14 +308,17 @@ Recent memory:
             )
 
         try:
-            request = self._llm.generate(
-                user_input=text, schema=LLMRequest, context=context
-            )
+            if confirmed:
+                # Validated when confirmation was asked for;
+                # no routing or inference needed.
+                request = pending.request
+            else:
+                request = await self._resolve_request(text)
 
             if request.action == "noop":
                 self._memory.add(
                     MemoryRecord(
-                        timestamp=datetime.utcnow(),
+                        timestamp=time.time(),
                         kind=MemoryKind.NOOP,
                         input=text,
                         output="No action taken.",
@@ -146,10 +332,11 @@ Recent memory:
                     message="I don't know how to do that yet.",
                 )
 
-            if self._requires_confirmation(request):
+            if not confirmed and self._requires_confirmation(request):
+                self._pending.hold(text, request)
                 self._memory.add(
                     MemoryRecord(
-                        timestamp=datetime.utcnow(),
+                        timestamp=time.time(),
                         kind=MemoryKind.COMMAND,
                         input=text,
                         output="confirmation_required",
@@ -164,40 +351,27 @@ Recent memory:
                     message=f"Confirm execution: {' '.join(request.command)} (yes/no)",
                 )
 
-            command_result = self._dispatcher.dispatch(request)
-            facts = self._llm.extract_facts(
-                user_input=text,
-                output=str(command_result),
-            )
-
-            for fact in facts:
-                if len(fact) < 10:
-                    continue
+            with timer.stage("dispatch"):
+                command_result = await asyncio.to_thread(
+                    self._dispatcher.dispatch, request
+                )
 
+            with timer.stage("memory"):
                 self._memory.add(
                     MemoryRecord(
-                        timestamp=datetime.utcnow(),
-                        kind=MemoryKind.FACT,
-                        input=fact,
-                        output=None,
+                        timestamp=time.time(),
+                        kind=MemoryKind.COMMAND,
+                        input=text,
+                        output=f"{request.action} executed successfully",
                         success=True,
-                        importance=MemoryImportance.FACT,
-                        ttl=None,
+                        importance=MemoryImportance.COMMAND,
+                        ttl=MemoryTTL.COMMAND,
                     )
                 )
+                self._maintainer.submit(text, str(command_result))
 
-            self._memory.add(
-                MemoryRecord(
-                    timestamp=datetime.utcnow(),
-                    kind=MemoryKind.COMMAND,
-                    input=text,
-                    output=f"{request.action} executed successfully",
-                    success=True,
-                    importance=MemoryImportance.COMMAND,
-                    ttl=MemoryTTL.COMMAND,
-                )
-            )
-            self._maybe_summarize_memory()
+            with timer.stage("logging"):
+                self._log_result(command_result)
 
             return AgentResponse(
                 success=True,
@@ -207,7 +381,7 @@ Recent memory:
             request = NoOpRequest(action="noop")
             self._memory.add(
                 MemoryRecord(
-                    timestamp=datetime.utcnow(),
+                    timestamp=time.time(),
                     kind=MemoryKind.ERROR,
                     input=text,
                     output=str(e),
@@ -225,7 +399,7 @@ Recent memory:
         except Exception as e:
             self._memory.add(
                 MemoryRecord(
-                    timestamp=datetime.utcnow(),
+                    timestamp=time.time(),
                     kind=MemoryKind.ERROR,
                     input=text,
                     output=str(e),
@@ -240,72 +414,51 @@ Recent memory:
                 message=f"Failed to process input:\n\t{str(e)}",
             )
 
-    def _build_capability_context(self) -> str:
+    async def _resolve_request(self, text: str) -> LLMRequest:
         """
-        Build a human-readable capability manifest for the LLM.
+        Turn input into a request: the router's fast path if it is
+        confident, otherwise the LLM with the assembled prompt.
         """
-        lines = ["Available actions:"]
-
-        for cap in self._dispatcher.capabilities():
-            lines.append(f"- {cap.name}: {cap.description}")
-            for arg, desc in cap.arguments.items():
-                lines.append(f"    - {arg}: {desc}")
-
-        return "\n".join(lines)
-
-    def _memory_context(
-        self,
-        limit: int = HISTORY_RECORDS_LIMIT,
-        min_importance: int = MIN_MEMORY_IMPORTANCE,
-    ) -> str:
-        records = self._memory.retrieve_for_llm(limit, min_importance)
-
-        if not records:
-            return "No relevant prior context."
-
-        lines = []
-        for r in records:
-            if r.kind == MemoryKind.FACT:
-                lines.append(f"- FACT: {r.input}")
-            else:
-                lines.append(f"- {r.kind.value}: {r.input}")
-
-        return "\n".join(lines)
+        timer = self._timer
 
-    def _maybe_summarize_memory(self) -> None:
-        commands = [
-            r for r in self._memory.all() if r.kind == MemoryKind.COMMAND and r.success
-        ]
+        with timer.stage("route"):
+            routed = self._router.route(text)
 
-        if len(commands) < 10:
-            return
+        if routed is not None:
+            return routed.request
 
-        oldest = commands[0].timestamp
-        if (datetime.utcnow() - oldest).seconds < 600:
-            return
+        with timer.stage("memory"):
+            prompt = self._assemble_prompt(text)
 
-        bullets = "\n".join(f"- {r.input}" for r in commands)
-
-        prompt = f"""
-{SUMMARY_PROMPT}
+        with timer.stage("llm"):
+            return await self._llm.generate(
+                user_input=text,
+                schema=LLMRequest,
+                context=prompt.context,
+                prefix=prompt.prefix,
+            )
 
-Commands:
-{bullets}
-"""
+    def _assemble_prompt(
+        self,
+        text: str,
+        min_importance: int = MIN_MEMORY_IMPORTANCE,
+    ) -> AssembledPrompt:
+        """
+        Memory candidates in priority order: records relevant to the
+        input first, then the latest few for conversational continuity.
+        """
+        relevant = self._memory.search(text, PROMPT_RELEVANT_RECORDS, min_importance)
+        recent = self._memory.retrieve_for_llm(PROMPT_RECENT_RECORDS, min_importance)
 
-        summary = self._llm.generate_text(prompt)
+        # Compared by value: the same row loaded twice from SQLite is
+        # two objects.
+        seen = set(relevant)
+        records = relevant + [r for r in reversed(recent) if r not in seen]
+        return self._assembler.assemble(records, text)
 
-        self._memory.add(
-            MemoryRecord(
-                timestamp=datetime.utcnow(),
-                kind=MemoryKind.FACT,
-                input="command_history",
-                output=summary,
-                success=True,
-                importance=MemoryImportance.FACT,
-                ttl=None,
-            )
-        )
+    def _log_result(self, command_result) -> None:
+        if isinstance(command_result, ShellResponse):
+            self._logger.log(command_result)
 
     def _requires_confirmation(self, request: LLMRequest) -> bool:
         if request.action != "shell":
@@ -322,10 +475,11 @@ Commands:
             try:
                 result = self._dispatcher.dispatch(step)
                 results.append(result)
+                self._log_result(result)
 
                 self._memory.add(
                     MemoryRecord(
-                        timestamp=datetime.utcnow(),
+                        timestamp=time.time(),
                         kind=MemoryKind.COMMAND,
                         input=str(step),
                         output=str(result),
@@ -340,7 +494,7 @@ Commands:
 
                 self._memory.add(
                     MemoryRecord(
-                        timestamp=datetime.utcnow(),
+                        timestamp=time.time(),
                         kind=MemoryKind.ERROR,
                         input=str(step),
                         output=str(e),
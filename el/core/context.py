@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterable, List, Optional
+
+from el.config.consts import PROMPT_TOKEN_BUDGET
+from el.core.capability import Capability
+from el.db.memory import MemoryKind, MemoryRecord
+from el.llm.tokens import estimate_tokens
+
+NO_MEMORY = "No relevant prior context."
+
+
+@dataclass(frozen=True)
+class AssembledPrompt:
+    """
+    Context for one LLM call.
+
+    prefix is static across turns (capability manifest);
+    context carries the budgeted dynamic sections.
+    """
+
+    prefix: str
+    context: str
+    tokens: int
+    memory_lines: int
+    dropped_lines: int
+
+
+class PromptAssembler:
+    """
+    Builds the LLM context for a turn.
+
+    Responsibilities:
+    - Render static sections once and cache them
+    - Estimate token counts
+    - Fill the memory section in priority order up to a token budget
+    """
+
+    def __init__(
+        self,
+        capabilities: Iterable[Capability],
+        token_budget: int = PROMPT_TOKEN_BUDGET,
+    ) -> None:
+        self._token_budget = token_budget
+        self._capabilities = self._render_capabilities(capabilities)
+        self._prefix = f"Capabilities:\n{self._capabilities}"
+        self._prefix_tokens = estimate_tokens(self._prefix)
+
+    @property
+    def capabilities(self) -> str:
+        return self._capabilities
+
+    @property
+    def prefix(self) -> str:
+        return self._prefix
+
+    def assemble(
+        self,
+        records: List[MemoryRecord],
+        user_input: str,
+        budget: Optional[int] = None,
+    ) -> AssembledPrompt:
+        """
+        Build the memory section for user_input so that prefix,
+        memory and input together stay within the token budget.
+
+        Args:
+            records: Memory candidates, most wanted first
+        """
+        budget = self._token_budget if budget is None else budget
+        remaining = budget - self._prefix_tokens - estimate_tokens(user_input)
+        lines, dropped = self._select_memory(records, remaining)
+
+        memory = "\n".join(lines) if lines else NO_MEMORY
+        context = f"Recent memory:\n{memory}"
+
+        return AssembledPrompt(
+            prefix=self._prefix,
+            context=context,
+            tokens=self._prefix_tokens + estimate_tokens(context),
+            memory_lines=len(lines),
+            dropped_lines=dropped,
+        )
+
+    def _select_memory(
+        self, records: List[MemoryRecord], budget: int
+    ) -> tuple[List[str], int]:
+        """
+        Greedily admit records in the order given and return the
+        admitted lines in chronological order.
+        """
+        admitted: List[tuple[float, str]] = []
+        dropped = 0
+        # Account for the section header.
+        spent = estimate_tokens("Recent memory:\n")
+
+        for record in records:
+            line = self._render_record(record)
+            cost = estimate_tokens(line) + 1
+
+            if spent + cost > budget:
+                dropped += 1
+                continue
+
+            spent += cost
+            admitted.append((record.timestamp, line))
+
+        admitted.sort(key=lambda item: item[0])
+        return [line for _, line in admitted], dropped
+
+    @staticmethod
+    def _render_record(record: MemoryRecord) -> str:
+        if record.kind == MemoryKind.FACT:
+            return f"- FACT: {record.input}"
+        return f"- {record.kind.value}: {record.input}"
+
+    @staticmethod
+    def _render_capabilities(capabilities: Iterable[Capability]) -> str:
+        """
+        Build a human-readable capability manifest for the LLM.
+        """
+        lines = ["Available actions:"]
+
+        for cap in capabilities:
+            lines.append(f"- {cap.name}: {cap.description}")
+            for arg, desc in cap.arguments.items():
+                lines.append(f"    - {arg}: {desc}")
+
+        return "\n".join(lines)
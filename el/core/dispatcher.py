@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 from el.config.consts import LOG_FILE
 from el.core.capability import Capability
@@ -32,8 +32,19 @@ class Dispatcher:
     No business logic, no parsing, no side effects.
     """
 
-    def __init__(self, executor: Executor) -> None:
-        self._logger = SQLiteExecutionLogger(db_path=Path.home() / LOG_FILE)
+    def __init__(
+        self,
+        executor: Executor,
+        logger: Optional[SQLiteExecutionLogger] = None,
+    ) -> None:
+        """
+        Args:
+            logger: Execution log to read history from (shared with
+                the caller; one on the home log file by default)
+        """
+        if logger is None:
+            logger = SQLiteExecutionLogger(db_path=Path.home() / LOG_FILE)
+        self._logger = logger
         self._skills = self._register_skills(executor)
 
     def _register_skills(self, executor: Executor) -> Dict[str, object]:
@@ -67,22 +78,30 @@ class Dispatcher:
                 stdout=result.stdout,
                 stderr=result.stderr,
                 timed_out=result.timed_out,
+                duration=result.duration,
+                user_time=result.user_time,
+                sys_time=result.sys_time,
+                max_rss=result.max_rss,
             )
 
         if request.action == "history":
             req = HistoryRequest.model_validate(request.model_dump())
-            records = self._skills["history"].run(req.limit)
+            records = self._skills["history"].run(
+                **req.model_dump(exclude={"action"})
+            )
 
             return HistoryResponse(
                 success=True,
                 records=[
                     HistoryRecord(
+                        id=r.id,
                         timestamp=r.timestamp,
                         command=r.command,
                         return_code=r.return_code,
                     )
                     for r in records
                 ],
+                next_cursor=records[-1].id if len(records) == req.limit else None,
             )
 
         if request.action == "port":
@@ -1,10 +1,17 @@
 from __future__ import annotations
 
+import os
+import resource
+import selectors
+import signal
 import subprocess
+import time
 from dataclasses import dataclass
-from typing import List, Set, Optional
+from typing import List, Set, Optional, Tuple
 from pathlib import Path
 
+_NO_USAGE = resource.struct_rusage((0,) * 16)
+
 
 @dataclass(frozen=True)
 class ExecutionPolicy:
@@ -30,6 +37,12 @@ class CommandResult:
     stdout: str
     stderr: str
     timed_out: bool = False
+    duration: float = 0.0  # wall clock, seconds
+    user_time: float = 0.0  # CPU in user mode, seconds
+    sys_time: float = 0.0  # CPU in kernel mode, seconds
+    # Peak resident set size in KiB. Linux counts the forked image
+    # before exec, so this never reads below the agent's own RSS.
+    max_rss: int = 0
 
 
 class CommandExecutionError(Exception):
@@ -57,6 +70,9 @@ class Executor:
     - Explicit command lists only
     - Timeout enforced
     - No privilege escalation
+
+    The child is reaped with wait4(), so every result carries the
+    command's own CPU time and peak memory alongside its duration.
     """
 
     def __init__(self, policy: ExecutionPolicy) -> None:
@@ -84,28 +100,123 @@ class Executor:
             raise CommandNotAllowedError(f"Command {binary} is not allowed")
 
         try:
-            completed = subprocess.run(
-                command,
-                cwd=self._policy.working_directory,
-                capture_output=True,
-                text=True,
-                timeout=self._policy.timeout_seconds,
-                check=False,
-            )
+            return self._run_measured(command)
+        except Exception as e:
+            raise CommandExecutionError(str(e)) from e
 
-            return CommandResult(
-                command=command,
-                return_code=completed.returncode,
-                stdout=completed.stdout.strip(),
-                stderr=completed.stderr.strip(),
-            )
-        except subprocess.TimeoutExpired as e:
+    def _run_measured(self, command: List[str]) -> CommandResult:
+        timeout = self._policy.timeout_seconds
+        started = time.perf_counter()
+        deadline = started + timeout
+
+        with subprocess.Popen(
+            command,
+            cwd=self._policy.working_directory,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        ) as proc:
+            output = _read_until(proc, deadline)
+            usage = _reap(proc, deadline) if output is not None else None
+            timed_out = usage is None
+            if timed_out:
+                # Still writing, or closed its output but kept running.
+                # Signal the pid directly: Popen.kill() polls first and
+                # would reap the child before wait4() sees it.
+                try:
+                    os.kill(proc.pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+                usage = _reap(proc, None)
+            duration = time.perf_counter() - started
+
+        measured = dict(
+            duration=duration,
+            user_time=usage.ru_utime,
+            sys_time=usage.ru_stime,
+            max_rss=usage.ru_maxrss,
+        )
+
+        if timed_out:
             return CommandResult(
                 command=command,
                 return_code=-1,
                 stdout="",
-                stderr=str(e),
+                stderr=str(subprocess.TimeoutExpired(command, timeout)),
                 timed_out=True,
+                **measured,
             )
-        except Exception as e:
-            raise CommandExecutionError(str(e)) from e
+
+        stdout, stderr = output
+        return CommandResult(
+            command=command,
+            return_code=proc.returncode,
+            stdout=stdout.strip(),
+            stderr=stderr.strip(),
+            **measured,
+        )
+
+
+def _read_until(
+    proc: subprocess.Popen, deadline: float
+) -> Optional[Tuple[str, str]]:
+    """
+    Read stdout and stderr to EOF.
+
+    Returns:
+        (stdout, stderr), or None if the deadline passed first
+    """
+    chunks = {proc.stdout: [], proc.stderr: []}
+
+    with selectors.DefaultSelector() as selector:
+        for pipe in chunks:
+            selector.register(pipe, selectors.EVENT_READ)
+
+        while selector.get_map():
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                return None
+
+            for key, _ in selector.select(remaining):
+                data = os.read(key.fd, 65536)
+                if data:
+                    chunks[key.fileobj].append(data)
+                else:
+                    selector.unregister(key.fileobj)
+
+    return tuple(
+        b"".join(chunks[pipe]).decode(errors="replace").replace("\r\n", "\n")
+        for pipe in (proc.stdout, proc.stderr)
+    )
+
+
+def _reap(
+    proc: subprocess.Popen, deadline: Optional[float]
+) -> Optional[resource.struct_rusage]:
+    """
+    wait4() the child, polling until deadline (blocking if None).
+
+    Returns:
+        The child's resource usage (zero if it was already reaped
+        elsewhere), or None if the deadline passed
+    """
+    try:
+        if deadline is None:
+            _, status, usage = os.wait4(proc.pid, 0)
+        else:
+            delay = 0.0005
+            while True:
+                pid, status, usage = os.wait4(proc.pid, os.WNOHANG)
+                if pid:
+                    break
+                if time.perf_counter() >= deadline:
+                    return None
+                time.sleep(delay)
+                delay = min(delay * 2, 0.05)
+    except ChildProcessError:
+        if proc.returncode is None:
+            proc.returncode = -1
+        return _NO_USAGE
+
+    # Popen must not wait for the child again.
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    return usage
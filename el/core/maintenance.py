@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import List, Optional
+
+from el.config.consts import (
+    MEMORY_BATCH_SIZE,
+    SUMMARY_MIN_AGE,
+    SUMMARY_MIN_COMMANDS,
+)
+from el.db.memory import (
+    MemoryImportance,
+    MemoryKind,
+    MemoryRecord,
+    MemoryStore,
+)
+from el.llm.client import LLMClient, LLMError
+from el.llm.prompts import SUMMARY_PROMPT
+
+SUMMARY_FACT = "command_history"
+
+
+@dataclass(frozen=True)
+class Turn:
+    """
+    A completed conversational turn awaiting fact extraction.
+    """
+
+    user_input: str
+    output: str
+
+
+class MemoryMaintainer:
+    """
+    Background memory maintenance.
+
+    Responsibilities:
+    - Queue completed turns off the response path
+    - Batch queued turns into a single fact-extraction prompt
+    - Write extracted facts into the MemoryStore
+    - Summarize command history when it grows
+
+    Summaries are rolling: the command_history fact is stamped with
+    the newest command it covers (the watermark), and each new summary
+    folds only the commands after it into the previous text, then
+    replaces it.
+    """
+
+    def __init__(
+        self,
+        llm: LLMClient,
+        memory: MemoryStore,
+        batch_size: int = MEMORY_BATCH_SIZE,
+    ) -> None:
+        self._llm = llm
+        self._memory = memory
+        self._batch_size = batch_size
+        self._queue: queue.Queue[Optional[Turn]] = queue.Queue()
+        self._summary: Optional[MemoryRecord] = None
+        self._thread = threading.Thread(
+            target=self._run,
+            name="el-memory-maintainer",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def submit(self, user_input: str, output: str) -> None:
+        """
+        Hand a completed turn to the worker. Never blocks.
+        """
+        self._queue.put(Turn(user_input=user_input, output=output))
+
+    def flush(self) -> None:
+        """
+        Block until every submitted turn has been processed.
+        """
+        self._queue.join()
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Drain pending turns and stop the worker.
+        """
+        if not self._thread.is_alive():
+            return
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        stopping = False
+
+        try:
+            self._summary = self._load_summary()
+        except Exception:
+            pass
+
+        while not stopping:
+            item = self._queue.get()
+            if item is None:
+                self._queue.task_done()
+                break
+
+            batch: List[Turn] = [item]
+
+            # Turns that queued up while the previous batch was
+            # being processed share one inference.
+            while len(batch) < self._batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+                if item is None:
+                    self._queue.task_done()
+                    stopping = True
+                    break
+
+                batch.append(item)
+
+            try:
+                self._process(batch)
+            except Exception:
+                # Memory maintenance is best effort and must never
+                # take the worker down.
+                pass
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _process(self, batch: List[Turn]) -> None:
+        facts = self._llm.extract_facts_batch(
+            (turn.user_input, turn.output) for turn in batch
+        )
+
+        for fact in facts:
+            if len(fact) < 10:
+                continue
+
+            self._memory.add(
+                MemoryRecord(
+                    timestamp=time.time(),
+                    kind=MemoryKind.FACT,
+                    input=fact,
+                    output=None,
+                    success=True,
+                    importance=MemoryImportance.FACT,
+                    ttl=None,
+                )
+            )
+
+        self._maybe_summarize_memory()
+
+    def _load_summary(self) -> Optional[MemoryRecord]:
+        """
+        The newest stored summary; older ones left by earlier versions
+        are dropped.
+        """
+        summaries = [
+            r for r in self._memory.of_kind(MemoryKind.FACT) if r.input == SUMMARY_FACT
+        ]
+        if not summaries:
+            return None
+
+        summaries.sort(key=lambda r: r.timestamp)
+        for old in summaries[:-1]:
+            self._memory.remove(old)
+        return summaries[-1]
+
+    def _maybe_summarize_memory(self) -> None:
+        watermark = self._summary.timestamp if self._summary else None
+        commands = [
+            r
+            for r in self._memory.of_kind(MemoryKind.COMMAND)
+            if r.success and (watermark is None or r.timestamp > watermark)
+        ]
+
+        if len(commands) < SUMMARY_MIN_COMMANDS:
+            return
+
+        oldest = commands[0].timestamp
+        if time.time() - oldest < SUMMARY_MIN_AGE:
+            return
+
+        bullets = "\n".join(f"- {r.input}" for r in commands)
+        previous = ""
+        if self._summary is not None and self._summary.output:
+            previous = f"""
+Previous summary:
+{self._summary.output}
+"""
+
+        prompt = f"""
+{SUMMARY_PROMPT}
+{previous}
+Commands:
+{bullets}
+"""
+
+        try:
+            summary = self._llm.generate_text(prompt)
+        except LLMError:
+            return
+
+        record = MemoryRecord(
+            timestamp=commands[-1].timestamp,
+            kind=MemoryKind.FACT,
+            input=SUMMARY_FACT,
+            output=summary,
+            success=True,
+            importance=MemoryImportance.FACT,
+            ttl=None,
+        )
+
+        if self._summary is not None:
+            self._memory.remove(self._summary)
+        self._memory.add(record)
+        self._summary = record
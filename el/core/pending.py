@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import Optional, Tuple
+
+from pydantic import BaseModel
+
+from el.config.consts import CONFIRMATION_TTL
+
+_YES = {"yes", "y"}
+_NO = {"no", "n", "cancel"}
+
+
+class Decision(str, Enum):
+    NONE = "none"  # nothing was pending
+    CONFIRMED = "confirmed"
+    CANCELLED = "cancelled"
+    EXPIRED = "expired"
+
+
+@dataclass(frozen=True)
+class PendingAction:
+    """
+    A validated request held back until the user confirms it.
+    """
+
+    input: str
+    request: BaseModel
+    expires_at: float
+
+
+class PendingActions:
+    """
+    Confirmation state machine.
+
+    idle --hold()--> awaiting --yes--> confirmed (request handed back)
+                              --other--> cancelled
+                              --ttl--> expired
+
+    Every resolve() returns to idle. The request is kept as the
+    validated object, so confirming it needs no further inference.
+    """
+
+    def __init__(self, ttl: float = CONFIRMATION_TTL) -> None:
+        self._ttl = ttl
+        self._pending: Optional[PendingAction] = None
+
+    @property
+    def pending(self) -> Optional[PendingAction]:
+        return self._pending
+
+    def hold(self, text: str, request: BaseModel) -> PendingAction:
+        """
+        Park request until the next answer, replacing anything
+        already pending.
+        """
+        self._pending = PendingAction(
+            input=text,
+            request=request,
+            expires_at=time.monotonic() + self._ttl,
+        )
+        return self._pending
+
+    def resolve(self, answer: str) -> Tuple[Decision, Optional[PendingAction]]:
+        """
+        Apply the user's answer to the pending action, if any.
+
+        An expired action only reports EXPIRED to an explicit yes/no;
+        any other input is treated as a fresh request (NONE).
+        """
+        action, self._pending = self._pending, None
+        if action is None:
+            return Decision.NONE, None
+
+        answer = answer.strip().lower()
+
+        if time.monotonic() > action.expires_at:
+            if answer in _YES or answer in _NO:
+                return Decision.EXPIRED, action
+            return Decision.NONE, None
+
+        if answer in _YES:
+            return Decision.CONFIRMED, action
+        return Decision.CANCELLED, action
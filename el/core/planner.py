@@ -1,8 +1,9 @@
 from pydantic import BaseModel
 from typing import List
 
-from el.llm.client import LLMClient
-from el.llm.prompts import PLANNER_PROMPT
+from el.llm.client import AsyncLLMClient, LLMClient
+from el.llm.prompts import PLANNER_PROMPT, STRUCTURED_PLANNER_PROMPT
+from el.llm.telemetry import LLMCallKind
 
 
 class Step(BaseModel):
@@ -18,17 +19,35 @@ class Plan(BaseModel):
 
 
 class Planner:
-    def __init__(self, llm: LLMClient):
+    def __init__(self, llm: LLMClient | AsyncLLMClient):
         self._llm = llm
 
     def generate_plan(self, user_input: str, context: str) -> Plan:
-        prompt = f"""
-{PLANNER_PROMPT}
-
+        return self._llm.generate(
+            user_input=self._build_prompt(user_input, context),
+            schema=Plan,
+            context="",
+            prefix=self._prompt(),
+            kind=LLMCallKind.PLAN,
+        )
+
+    async def generate_plan_async(self, user_input: str, context: str) -> Plan:
+        return await self._llm.generate(
+            user_input=self._build_prompt(user_input, context),
+            schema=Plan,
+            context="",
+            prefix=self._prompt(),
+            kind=LLMCallKind.PLAN,
+        )
+
+    def _prompt(self) -> str:
+        return STRUCTURED_PLANNER_PROMPT if self._llm.structured else PLANNER_PROMPT
+
+    def _build_prompt(self, user_input: str, context: str) -> str:
+        return f"""
 Context:
 {context}
 
 User request:
 {user_input}
 """
-        return self._llm.generate(user_input=prompt, schema=Plan, context="")
@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import re
+import shlex
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, List, Optional, Set
+
+from pydantic import BaseModel
+
+from el.config.consts import (
+    ALLOWED_COMMANDS,
+    HISTORY_RECORDS_LIMIT,
+    ROUTER_CONFIDENCE_THRESHOLD,
+)
+from el.llm.schemas import PortLLMRequest, ShellLLMRequest
+from el.models.request import HistoryRequest
+
+
+@dataclass(frozen=True)
+class Route:
+    """
+    A deterministic mapping from an input pattern to a request.
+    """
+
+    name: str
+    pattern: re.Pattern
+    build: Callable[[re.Match], BaseModel]
+    confidence: float
+
+
+@dataclass(frozen=True)
+class RouteMatch:
+    route: str
+    request: BaseModel
+    confidence: float
+
+
+@dataclass
+class RouterStats:
+    hits: Counter = field(default_factory=Counter)
+    below_threshold: Counter = field(default_factory=Counter)
+    misses: int = 0
+
+    @property
+    def llm_calls_saved(self) -> int:
+        return sum(self.hits.values())
+
+
+def _shell(*command: str) -> Callable[[re.Match], BaseModel]:
+    return lambda m: ShellLLMRequest(action="shell", command=list(command))
+
+
+def _phrase(pattern: str) -> re.Pattern:
+    return re.compile(rf"^(?:{pattern})$", re.IGNORECASE)
+
+
+_WHAT_IS = r"what(?:'s|\s+is)"
+
+DEFAULT_ROUTES: List[Route] = [
+    Route(
+        name="port",
+        pattern=_phrase(
+            rf"(?:(?:{_WHAT_IS}|who(?:'s|\s+is))\s+"
+            r"(?:on|using|listening\s+on|running\s+on)\s+)?"
+            r"port\s+(?P<port>\d{1,5})"
+        ),
+        build=lambda m: PortLLMRequest(action="port", port=int(m["port"])),
+        confidence=0.95,
+    ),
+    Route(
+        name="history",
+        pattern=_phrase(
+            r"(?:show\s+)?(?:me\s+)?(?:my\s+)?(?:command\s+)?history"
+            r"|(?:show\s+)?(?:me\s+)?(?:the\s+)?last\s+(?P<limit>\d{1,3})\s+commands"
+        ),
+        build=lambda m: HistoryRequest(
+            limit=min(int(m["limit"] or HISTORY_RECORDS_LIMIT), 100)
+        ),
+        confidence=0.95,
+    ),
+    Route(
+        name="last_failure",
+        pattern=_phrase(
+            r"when\s+did\s+(?:the\s+)?(?P<binary>[\w.-]+)\s+(?:command\s+)?"
+            r"last\s+fail"
+        ),
+        build=lambda m: HistoryRequest(limit=1, binary=m["binary"], failed=True),
+        confidence=0.95,
+    ),
+    Route(
+        name="whoami",
+        pattern=_phrase(r"who\s*am\s*i|what\s+is\s+my\s+user(?:name)?"),
+        build=_shell("whoami"),
+        confidence=0.95,
+    ),
+    Route(
+        name="pwd",
+        pattern=_phrase(
+            r"where\s+am\s+i"
+            r"|(?:what\s+is\s+the\s+)?current\s+(?:working\s+)?directory"
+        ),
+        build=_shell("pwd"),
+        confidence=0.9,
+    ),
+    Route(
+        name="hostname",
+        pattern=_phrase(rf"{_WHAT_IS}\s+(?:my|the)\s+hostname"),
+        build=_shell("hostname"),
+        confidence=0.95,
+    ),
+    Route(
+        name="date",
+        pattern=_phrase(
+            rf"{_WHAT_IS}\s+the\s+(?:date|time)(?:\s+now)?|what\s+time\s+is\s+it"
+        ),
+        build=_shell("date"),
+        confidence=0.9,
+    ),
+    Route(
+        name="disk",
+        pattern=_phrase(r"(?:show\s+)?(?:the\s+)?disk\s+(?:space|usage)"),
+        build=_shell("df", "-h"),
+        confidence=0.9,
+    ),
+    Route(
+        name="memory",
+        pattern=_phrase(
+            r"(?:show\s+)?(?:the\s+)?(?:memory|ram)\s+usage|free\s+memory"
+        ),
+        build=_shell("free", "-h"),
+        confidence=0.9,
+    ),
+]
+
+# Arguments a literal command may carry without looking like prose.
+_ARGUMENT = re.compile(r"^[\w./~:=+,@%-]+$")
+# Plain words are ambiguous ("cat is an animal"); flags and paths are not.
+_PLAIN_WORD = re.compile(r"^[a-zA-Z]+$")
+
+
+class IntentRouter:
+    """
+    Deterministic fast path in front of the LLM.
+
+    Maps unambiguous inputs (literal allowed commands, well-known
+    phrases) straight to requests. Anything below the confidence
+    threshold falls through to the LLM.
+    """
+
+    def __init__(
+        self,
+        routes: Iterable[Route] = DEFAULT_ROUTES,
+        allowed_commands: Set[str] = ALLOWED_COMMANDS,
+        threshold: float = ROUTER_CONFIDENCE_THRESHOLD,
+    ) -> None:
+        self._routes = list(routes)
+        self._allowed_commands = allowed_commands
+        self._threshold = threshold
+        self._lock = threading.Lock()
+        self.stats = RouterStats()
+
+    def route(self, text: str) -> Optional[RouteMatch]:
+        normalized = " ".join(text.strip().rstrip("?!.").split())
+        # A weak literal-command reading ("free memory") must not hide
+        # a phrase route for the same words.
+        candidates = [
+            m
+            for m in (self._match_command(normalized), self._match_routes(normalized))
+            if m is not None
+        ]
+        match = max(candidates, key=lambda m: m.confidence, default=None)
+
+        with self._lock:
+            if match is None:
+                self.stats.misses += 1
+                return None
+
+            if match.confidence < self._threshold:
+                self.stats.below_threshold[match.route] += 1
+                return None
+
+            self.stats.hits[match.route] += 1
+            return match
+
+    def _match_command(self, text: str) -> Optional[RouteMatch]:
+        """
+        A literal invocation of an allowed command, e.g. "pwd", "df -h".
+        """
+        try:
+            tokens = shlex.split(text)
+        except ValueError:
+            return None
+
+        if not tokens or tokens[0] not in self._allowed_commands:
+            return None
+
+        args = tokens[1:]
+        if not all(_ARGUMENT.match(a) for a in args):
+            return None
+
+        if not args:
+            confidence = 1.0
+        elif any(_PLAIN_WORD.match(a) for a in args):
+            confidence = 0.6
+        else:
+            confidence = 0.95
+
+        return RouteMatch(
+            route="command",
+            request=ShellLLMRequest(action="shell", command=tokens),
+            confidence=confidence,
+        )
+
+    def _match_routes(self, text: str) -> Optional[RouteMatch]:
+        for route in self._routes:
+            m = route.pattern.match(text)
+            if m is None:
+                continue
+
+            try:
+                request = route.build(m)
+            except ValueError:
+                # Pattern matched but arguments are out of range
+                # (e.g. port 99999); let the LLM deal with it.
+                return None
+
+            return RouteMatch(
+                route=route.name,
+                request=request,
+                confidence=route.confidence,
+            )
+
+        return None
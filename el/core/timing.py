@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+
+class StageTimer:
+    """
+    Wall-clock time spent per pipeline stage within one turn.
+
+    Stages may be entered several times; their durations add up.
+    """
+
+    def __init__(self) -> None:
+        self._stages: Dict[str, float] = defaultdict(float)
+        self._started = time.perf_counter()
+
+    def reset(self) -> None:
+        self._stages.clear()
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._stages[name] += (time.perf_counter() - started) * 1000
+
+    def snapshot(self) -> Dict[str, float]:
+        """
+        Milliseconds per stage, plus "total" since the last reset.
+        """
+        timings = dict(self._stages)
+        timings["total"] = (time.perf_counter() - self._started) * 1000
+        return timings
@@ -1 +1 @@
-from el.db import mongo, sqlite
+from el.db import bm25, memory, mongo, retention, sqlite
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import math
+import re
+from collections import Counter, defaultdict
+from typing import Dict, Hashable, Iterable, List, Tuple
+
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9_.-]*")
+
+_STOPWORDS = frozenset(
+    """
+    a an and are as at be by can do does for from how i in is it me my
+    of on or please show tell that the this to was what which who with
+    you your
+    """.split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in _TOKEN.findall(text.lower()) if t not in _STOPWORDS]
+
+
+class BM25Index:
+    """
+    Incremental Okapi BM25 index.
+
+    Documents can be added and removed at any time; corpus statistics
+    (document count, average length, document frequencies) are kept
+    up to date so no rebuild is ever needed.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75) -> None:
+        self._k1 = k1
+        self._b = b
+        self._postings: Dict[str, Dict[Hashable, int]] = defaultdict(dict)
+        self._terms: Dict[Hashable, Counter] = {}
+        self._lengths: Dict[Hashable, int] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def add(self, doc_id: Hashable, text: str) -> None:
+        if doc_id in self._lengths:
+            self.remove(doc_id)
+
+        terms = Counter(tokenize(text))
+        for term, tf in terms.items():
+            self._postings[term][doc_id] = tf
+
+        self._terms[doc_id] = terms
+        self._lengths[doc_id] = sum(terms.values())
+        self._total_length += self._lengths[doc_id]
+
+    def remove(self, doc_id: Hashable) -> None:
+        terms = self._terms.pop(doc_id, None)
+        if terms is None:
+            return
+
+        for term in terms:
+            postings = self._postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self._postings[term]
+
+        self._total_length -= self._lengths.pop(doc_id)
+
+    def scores(self, query: str) -> Iterable[Tuple[Hashable, float]]:
+        """
+        (doc_id, score) for every document sharing a term with query,
+        best first.
+        """
+        n = len(self._lengths)
+        if not n:
+            return []
+
+        avg_length = self._total_length / n or 1.0
+        scores: Dict[Hashable, float] = defaultdict(float)
+
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+
+            df = len(postings)
+            idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+            for doc_id, tf in postings.items():
+                norm = 1 - self._b + self._b * self._lengths[doc_id] / avg_length
+                scores[doc_id] += idf * tf * (self._k1 + 1) / (tf + self._k1 * norm)
+
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)
@@ -1,11 +1,49 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from datetime import datetime
-from typing import List, Optional
+import hashlib
+import heapq
+import queue
+import re
+import sqlite3
+import struct
+import threading
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass, field, replace
+from operator import eq
+from pathlib import Path
+from typing import Deque, Dict, FrozenSet, List, Optional, Tuple
 from enum import Enum, IntEnum
 
-from el.config.consts import HISTORY_RECORDS_LIMIT, MIN_MEMORY_IMPORTANCE
+from el.config.consts import (
+    FACT_SIMILARITY_THRESHOLD,
+    HISTORY_RECORDS_LIMIT,
+    MEMORY_HALF_LIFE,
+    MEMORY_LOAD_WINDOW,
+    MEMORY_MAX_RECORDS,
+    MEMORY_WRITE_BATCH,
+    MIN_MEMORY_IMPORTANCE,
+)
+from el.db.bm25 import BM25Index
+
+# Writer operations for SQLiteMemoryStore.
+_INSERT = "insert"
+_DELETE = "delete"
+
+_WORD = re.compile(r"\w+")
+# Values that tell otherwise similar facts apart (ports, pids,
+# versions, paths); near duplicates must agree on all of them.
+_SPECIFIC = re.compile(r"[^\s\"'`]*/[^\s\"'`]*|\d+(?:\.\d+)*")
+
+# MinHash: 16 bands of 4 rows put the LSH candidate threshold near
+# a Jaccard similarity of 0.5; candidates are then checked exactly
+# against FACT_SIMILARITY_THRESHOLD.
+_SHINGLE_SIZE = 4
+_MINHASH_BANDS = 16
+_MINHASH_ROWS = 4
+
+# (normalized digest, MinHash signature, numbers and paths)
+_Signature = Tuple[str, Tuple[int, ...], FrozenSet[str]]
 
 
 class MemoryKind(str, Enum):
@@ -28,78 +66,767 @@ class MemoryTTL(IntEnum):
     ERROR = 1800
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class MemoryRecord:
-    timestamp: datetime
+    """
+    One memory entry. Slotted, with times as epoch seconds, so a
+    record stays small and expiry is a float comparison.
+    """
+
+    timestamp: float  # epoch seconds
     kind: MemoryKind  # "shell", "port", "noop", "system"
     input: str
     output: Optional[str]
     success: bool
     importance: MemoryImportance  # 1–5
     ttl: MemoryTTL | None
+    expires_at: Optional[float] = field(init=False, compare=False, repr=False)
+
+    def __post_init__(self) -> None:
+        # Enum members are singletons, so kind, importance and ttl
+        # are shared by every record rather than stored per record.
+        object.__setattr__(
+            self,
+            "expires_at",
+            self.timestamp + self.ttl if self.ttl is not None else None,
+        )
 
 
 class MemoryStore:
     """
     Agent-owned memory.
     Append-only. No logic.
+
+    Safe to share with the background maintenance worker.
+
+    Records are indexed by kind and by importance (deques in
+    insertion order) and expiring records have their deadline on a
+    min-heap. Expired records are purged as their deadlines pass,
+    so reads only touch live records near the newest end and
+    per-turn cost does not grow with the length of the session.
+
+    Live records are also kept in a BM25 index for search().
+
+    Compaction keeps the store bounded: a fact that duplicates a
+    stored one (exactly or nearly) is merged into it, and past
+    max_records the records with the lowest importance-weighted
+    recency are evicted.
     """
 
-    def __init__(self) -> None:
-        self._records: List[MemoryRecord] = []
+    def __init__(
+        self,
+        max_records: int = MEMORY_MAX_RECORDS,
+        half_life: float = MEMORY_HALF_LIFE,
+    ) -> None:
+        self._max_records = max_records
+        self._half_life = half_life
+        self._duplicates = DuplicateIndex()
+        self._dead = 0
+        self._seq = 0
+        self._live: Dict[int, MemoryRecord] = {}
+        self._by_kind: Dict[MemoryKind, Deque[Tuple[int, MemoryRecord]]] = (
+            defaultdict(deque)
+        )
+        self._by_importance: Dict[int, Deque[Tuple[int, MemoryRecord]]] = (
+            defaultdict(deque)
+        )
+        self._expiry: List[Tuple[float, int]] = []
+        self._index = BM25Index()
+        self._last: Optional[MemoryRecord] = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._purge(_now())
+            return len(self._live)
 
     def add(self, record: MemoryRecord) -> None:
-        self._records.append(record)
+        self._add(record)
+
+    def _add(
+        self, record: MemoryRecord
+    ) -> Tuple[MemoryRecord, List[MemoryRecord]]:
+        """
+        Store record, merging it into a duplicate fact if there is one.
+
+        Returns:
+            (stored, removed) - the record actually stored (record or
+            a merge of it) and the records it displaced, whether
+            merged away or evicted.
+        """
+        removed: List[MemoryRecord] = []
+
+        with self._lock:
+            if record.kind == MemoryKind.FACT:
+                duplicate = self._duplicates.find(_searchable(record))
+                if duplicate is not None:
+                    existing = self._remove(duplicate)
+                    removed.append(existing)
+                    record = _merge(existing, record)
+
+            seq = self._seq
+            self._seq += 1
+
+            self._live[seq] = record
+            self._by_kind[record.kind].append((seq, record))
+            self._by_importance[int(record.importance)].append((seq, record))
+            if record.ttl is not None:
+                heapq.heappush(self._expiry, (record.expires_at, seq))
+            if record.kind == MemoryKind.FACT:
+                self._duplicates.add(seq, _searchable(record))
+            self._index.add(seq, _searchable(record))
+            self._last = record
+
+            if len(self._live) > self._max_records:
+                removed.extend(self._evict())
+
+        return record, removed
+
+    def remove(self, record: MemoryRecord) -> bool:
+        """
+        Drop a live record equal to record.
+
+        Returns:
+            True if one was found
+        """
+        with self._lock:
+            for seq, stored in reversed(self._by_kind[record.kind]):
+                if seq in self._live and stored == record:
+                    self._remove(seq)
+                    return True
+        return False
+
+    def last(self) -> Optional[MemoryRecord]:
+        """
+        The most recently added record, expired or not.
+        """
+        return self._last
+
+    def flush(self) -> None:
+        """
+        Block until added records are durable. Nothing to do in memory.
+        """
+
+    def close(self) -> None:
+        """
+        Release resources. Nothing to do in memory.
+        """
 
     def recent(
         self,
         limit: int = HISTORY_RECORDS_LIMIT,
         min_importance: int = MIN_MEMORY_IMPORTANCE,
     ) -> List[MemoryRecord]:
-        now = datetime.utcnow()
-
-        valid = [
-            r
-            for r in self._records
-            if not self._is_expired(r, now) and r.importance >= min_importance
-        ]
-
-        return valid[-limit:]
+        return self._newest(limit, min_importance)
 
     def all(self) -> List[MemoryRecord]:
-        return list(self._records)
+        with self._lock:
+            self._purge(_now())
+            return list(self._live.values())
 
-    def _is_expired(self, record: MemoryRecord, now: datetime) -> bool:
-        if record.ttl is None:
-            return False
-        return (now - record.timestamp).total_seconds() > record.ttl
+    def of_kind(self, kind: MemoryKind) -> List[MemoryRecord]:
+        """
+        Live records of one kind, oldest first.
+        """
+        with self._lock:
+            self._purge(_now())
+            return [r for seq, r in self._by_kind[kind] if seq in self._live]
 
     def retrieve_for_llm(
         self,
         limit: int,
         min_importance: int,
     ) -> list[MemoryRecord]:
-        now = datetime.utcnow()
-        selected: list[MemoryRecord] = []
-
-        for r in reversed(self._records):
-            # TTL check
-            if r.ttl is not None:
-                age = (now - r.timestamp).seconds
-                if age > r.ttl:
+        return self._newest(limit, min_importance, exclude=MemoryKind.NOOP)
+
+    def search(
+        self,
+        query: str,
+        limit: int,
+        min_importance: int = MIN_MEMORY_IMPORTANCE,
+    ) -> List[MemoryRecord]:
+        """
+        Up to limit live records most relevant to query (BM25),
+        best first. Records sharing no terms with query are not returned.
+        """
+        with self._lock:
+            self._purge(_now())
+            selected: List[MemoryRecord] = []
+
+            for seq, _ in self._index.scores(query):
+                if len(selected) >= limit:
+                    break
+                record = self._live[seq]
+                if record.importance < min_importance:
+                    continue
+                if record.kind == MemoryKind.NOOP:
+                    continue
+                selected.append(record)
+
+        return selected
+
+    def _newest(
+        self,
+        limit: int,
+        min_importance: int,
+        exclude: Optional[MemoryKind] = None,
+    ) -> List[MemoryRecord]:
+        """
+        Up to limit live records with importance >= min_importance,
+        oldest first, merged newest-first from the importance buckets.
+        """
+        with self._lock:
+            self._purge(_now())
+
+            buckets = [
+                reversed(bucket)
+                for importance, bucket in self._by_importance.items()
+                if importance >= min_importance
+            ]
+            selected: List[MemoryRecord] = []
+
+            for seq, record in heapq.merge(*buckets, key=_seq, reverse=True):
+                if len(selected) >= limit:
+                    break
+                if seq not in self._live or record.kind == exclude:
                     continue
+                selected.append(record)
 
-            # Importance check
-            if r.importance.value < min_importance:
+        selected.reverse()
+        return selected
+
+    def _purge(self, now: float) -> None:
+        """
+        Drop records whose deadline has passed. Caller holds the lock.
+        """
+        while self._expiry and self._expiry[0][0] < now:
+            _, seq = heapq.heappop(self._expiry)
+            if seq not in self._live:
+                # Already merged away or evicted.
                 continue
 
-            # Noise filter
-            if r.kind == MemoryKind.NOOP:
+            record = self._live.pop(seq)
+            self._index.remove(seq)
+            self._trim(self._by_kind[record.kind])
+            self._trim(self._by_importance[int(record.importance)])
+
+    def _trim(self, index: Deque[Tuple[int, MemoryRecord]]) -> None:
+        # Records of one kind share a TTL, so they expire from the left.
+        while index and index[0][0] not in self._live:
+            index.popleft()
+
+    def _evict(self) -> List[MemoryRecord]:
+        """
+        Shrink to 90% of max_records, dropping the records with the
+        lowest importance * recency weight. Caller holds the lock.
+
+        Evicting a batch at a time keeps the sort amortized.
+        """
+        now = _now()
+        target = int(self._max_records * 0.9)
+
+        def weight(seq: int) -> float:
+            record = self._live[seq]
+            age = max(now - record.timestamp, 0.0)
+            return record.importance * 0.5 ** (age / self._half_life)
+
+        victims = heapq.nsmallest(len(self._live) - target, self._live, key=weight)
+        return [self._remove(seq) for seq in victims]
+
+    def _remove(self, seq: int) -> MemoryRecord:
+        """
+        Drop one record from every index. Caller holds the lock.
+
+        Deque entries are left behind and skipped on read; once they
+        outnumber live records the deques are rebuilt.
+        """
+        record = self._live.pop(seq)
+        self._index.remove(seq)
+        self._duplicates.remove(seq)
+
+        self._dead += 1
+        if self._dead > len(self._live):
+            self._rebuild()
+
+        return record
+
+    def _rebuild(self) -> None:
+        self._by_kind.clear()
+        self._by_importance.clear()
+
+        for seq, record in self._live.items():
+            self._by_kind[record.kind].append((seq, record))
+            self._by_importance[int(record.importance)].append((seq, record))
+
+        self._dead = 0
+
+
+class DuplicateIndex:
+    """
+    Exact and near-duplicate lookup for short texts.
+
+    Exact duplicates are found by hashing the normalized text.
+    Near duplicates are found with MinHash signatures over character
+    shingles, bucketed by LSH bands so a lookup only compares against
+    plausible candidates; a candidate matches when its estimated
+    Jaccard similarity reaches threshold and it mentions the same
+    numbers and paths (so "pid 4242" never matches "pid 4243").
+    """
+
+    def __init__(
+        self,
+        threshold: float = FACT_SIMILARITY_THRESHOLD,
+        bands: int = _MINHASH_BANDS,
+        rows: int = _MINHASH_ROWS,
+    ) -> None:
+        self._threshold = threshold
+        self._bands = bands
+        self._rows = rows
+        self._exact: Dict[str, int] = {}
+        self._signatures: Dict[int, _Signature] = {}
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], set] = defaultdict(set)
+        self._cached: Optional[Tuple[str, _Signature]] = None
+
+    def find(self, text: str) -> Optional[int]:
+        digest, signature, specifics = self._signature(text)
+        key = self._exact.get(digest)
+        if key is not None:
+            return key
+
+        candidates = set()
+        for band in self._band_keys(signature):
+            candidates |= self._buckets.get(band, set())
+
+        best, best_similarity = None, self._threshold
+        for key in candidates:
+            _, other, other_specifics = self._signatures[key]
+            if other_specifics != specifics:
                 continue
+            similarity = _similarity(signature, other)
+            if similarity >= best_similarity:
+                best, best_similarity = key, similarity
+
+        return best
+
+    def add(self, key: int, text: str) -> None:
+        entry = self._signature(text)
+        digest, signature, _ = entry
+
+        self._exact[digest] = key
+        self._signatures[key] = entry
+        for band in self._band_keys(signature):
+            self._buckets[band].add(key)
+
+    def remove(self, key: int) -> None:
+        entry = self._signatures.pop(key, None)
+        if entry is None:
+            return
+
+        digest, signature, _ = entry
+        if self._exact.get(digest) == key:
+            del self._exact[digest]
+
+        for band in self._band_keys(signature):
+            bucket = self._buckets[band]
+            bucket.discard(key)
+            if not bucket:
+                del self._buckets[band]
+
+    def _signature(self, text: str) -> _Signature:
+        # find() is usually followed by add() of the same text.
+        if self._cached is None or self._cached[0] != text:
+            normalized = _normalize(text)
+            self._cached = (
+                text,
+                (
+                    _digest(normalized),
+                    _minhash(normalized, self._bands * self._rows),
+                    _specifics(text),
+                ),
+            )
+        return self._cached[1]
+
+    def _band_keys(
+        self, signature: Tuple[int, ...]
+    ) -> List[Tuple[int, Tuple[int, ...]]]:
+        rows = self._rows
+        return [
+            (band, signature[band * rows : (band + 1) * rows])
+            for band in range(self._bands)
+        ]
+
+
+class SQLiteMemoryStore(MemoryStore):
+    """
+    MemoryStore persisted to SQLite, so extracted facts survive restarts.
+
+    Responsibilities:
+    - Keep the in-memory indexes as a cache tier holding every fact
+      and the retrieval window of other records (loaded at startup)
+      plus this session's records
+    - Write changes in batches from a background thread (WAL mode)
+    - Expire lazily: reads filter on expires_at, writes prune old rows
+    - Fall back to SQLite only for reads the cache cannot answer
+    - Mirror compaction (merged and evicted records) on disk
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        window: int = MEMORY_LOAD_WINDOW,
+        batch_size: int = MEMORY_WRITE_BATCH,
+        max_records: int = MEMORY_MAX_RECORDS,
+        half_life: float = MEMORY_HALF_LIFE,
+    ) -> None:
+        super().__init__(max_records=max_records, half_life=half_life)
+        self._db_path = db_path
+        self._window = window
+        self._batch_size = batch_size
+        self._queue: queue.Queue[Optional[Tuple[str, MemoryRecord]]] = (
+            queue.Queue()
+        )
+
+        self._init_db()
+        self._compact_disk()
+        self._partial = self._load_window()
+
+        self._thread = threading.Thread(
+            target=self._run,
+            name="el-memory-writer",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def _init_db(self) -> None:
+        """
+        Creates the memory table and its indexes
+        """
+        with sqlite3.connect(self._db_path) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS memory (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp REAL NOT NULL,
+                    kind TEXT NOT NULL,
+                    input TEXT NOT NULL,
+                    output TEXT,
+                    success INTEGER NOT NULL,
+                    importance INTEGER NOT NULL,
+                    ttl INTEGER,
+                    expires_at REAL
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_memory_kind ON memory (kind, id)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_memory_importance "
+                "ON memory (importance, id)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_memory_timestamp "
+                "ON memory (timestamp)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_memory_expires "
+                "ON memory (expires_at)"
+            )
+
+    def _compact_disk(self) -> None:
+        """
+        Drop expired rows and, past max_records, the rows with the
+        lowest importance-weighted recency.
+        """
+        now = _now()
+
+        with sqlite3.connect(self._db_path) as conn:
+            conn.execute("DELETE FROM memory WHERE expires_at < ?", (now,))
+            rows = conn.execute(
+                "SELECT id, importance, timestamp FROM memory"
+            ).fetchall()
+
+            excess = len(rows) - self._max_records
+            if excess <= 0:
+                return
+
+            victims = heapq.nsmallest(
+                excess,
+                rows,
+                key=lambda row: row[1]
+                * 0.5 ** (max(now - row[2], 0.0) / self._half_life),
+            )
+            conn.executemany(
+                "DELETE FROM memory WHERE id = ?", [(row[0],) for row in victims]
+            )
+
+    def _load_window(self) -> bool:
+        """
+        Fill the cache with every fact (so duplicates and searches see
+        them all) and the newest other records retrieval can return.
+
+        Returns:
+            True if older live records were left on disk.
+        """
+        facts = self._select("kind = ?", (MemoryKind.FACT.value,))
+        others = self._select(
+            "kind != ? AND importance >= ?",
+            (MemoryKind.FACT.value, MIN_MEMORY_IMPORTANCE),
+            limit=self._window + 1,
+        )
+        partial = len(others) > self._window
+
+        records = facts + others[: self._window]
+        records.sort(key=lambda r: r.timestamp)
+
+        for record in records:
+            stored, removed = self._add(record)
+            if stored is not record:
+                # Duplicates merged on load: replace both rows.
+                removed.append(record)
+            for old in removed:
+                self._queue.put((_DELETE, old))
+            if stored is not record:
+                self._queue.put((_INSERT, stored))
+
+        return partial
+
+    def add(self, record: MemoryRecord) -> None:
+        stored, removed = self._add(record)
+        for old in removed:
+            self._queue.put((_DELETE, old))
+        self._queue.put((_INSERT, stored))
+
+    def remove(self, record: MemoryRecord) -> bool:
+        found = super().remove(record)
+        self._queue.put((_DELETE, record))
+        return found
+
+    def flush(self) -> None:
+        """
+        Block until every change is on disk.
+        """
+        self._queue.join()
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Write pending changes and stop the writer.
+        """
+        if not self._thread.is_alive():
+            return
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def all(self) -> List[MemoryRecord]:
+        self.flush()
+        return list(reversed(self._select("1", ())))
+
+    def of_kind(self, kind: MemoryKind) -> List[MemoryRecord]:
+        if not self._misses(MemoryImportance[kind.name]):
+            return super().of_kind(kind)
+
+        self.flush()
+        return list(reversed(self._select("kind = ?", (kind.value,))))
+
+    def _newest(
+        self,
+        limit: int,
+        min_importance: int,
+        exclude: Optional[MemoryKind] = None,
+    ) -> List[MemoryRecord]:
+        if min_importance >= MIN_MEMORY_IMPORTANCE:
+            selected = super()._newest(limit, min_importance, exclude)
+            if len(selected) >= limit or not self._partial:
+                return selected
+
+        self.flush()
+        where, params = "importance >= ?", (min_importance,)
+        if exclude is not None:
+            where, params = where + " AND kind != ?", params + (exclude.value,)
+        return list(reversed(self._select(where, params, limit=limit)))
+
+    def _misses(self, min_importance: int) -> bool:
+        """
+        Whether live records matching min_importance may exist on
+        disk but not in the cache.
+        """
+        return self._partial or min_importance < MIN_MEMORY_IMPORTANCE
+
+    def _select(
+        self, where: str, params: tuple, limit: int = -1
+    ) -> List[MemoryRecord]:
+        """
+        Live records matching where, newest first.
+        """
+        with sqlite3.connect(self._db_path) as conn:
+            rows = conn.execute(
+                f"""
+                SELECT timestamp, kind, input, output, success, importance, ttl
+                FROM memory
+                WHERE ({where}) AND (expires_at IS NULL OR expires_at >= ?)
+                ORDER BY id DESC
+                LIMIT ?
+                """,
+                (*params, _now(), limit),
+            ).fetchall()
+
+        return [
+            MemoryRecord(
+                timestamp=ts,
+                kind=MemoryKind(kind),
+                input=text,
+                output=output,
+                success=bool(success),
+                importance=MemoryImportance(importance),
+                ttl=MemoryTTL(ttl) if ttl is not None else None,
+            )
+            for ts, kind, text, output, success, importance, ttl in rows
+        ]
+
+    def _run(self) -> None:
+        conn = sqlite3.connect(self._db_path)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        stopping = False
+
+        try:
+            while not stopping:
+                item = self._queue.get()
+                batch: List[Tuple[str, MemoryRecord]] = []
+
+                # Changes made while the previous batch was being
+                # written share one transaction.
+                while item is not None:
+                    batch.append(item)
+                    if len(batch) >= self._batch_size:
+                        break
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+
+                stopping = item is None
+
+                try:
+                    self._write(conn, batch)
+                except sqlite3.Error:
+                    # Persistence is best effort; the cache still
+                    # serves this session.
+                    pass
+                finally:
+                    for _ in range(len(batch) + int(stopping)):
+                        self._queue.task_done()
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _write(
+        conn: sqlite3.Connection, batch: List[Tuple[str, MemoryRecord]]
+    ) -> None:
+        with conn:
+            for op, r in batch:
+                if op == _DELETE:
+                    conn.execute(
+                        """
+                        DELETE FROM memory
+                        WHERE kind = ? AND timestamp = ? AND input = ?
+                        """,
+                        (r.kind.value, r.timestamp, r.input),
+                    )
+                    continue
+
+                conn.execute(
+                    """
+                    INSERT INTO memory (
+                        timestamp,
+                        kind,
+                        input,
+                        output,
+                        success,
+                        importance,
+                        ttl,
+                        expires_at
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (
+                        r.timestamp,
+                        r.kind.value,
+                        r.input,
+                        r.output,
+                        int(r.success),
+                        int(r.importance),
+                        r.ttl,
+                        r.expires_at,
+                    ),
+                )
+
+            conn.execute("DELETE FROM memory WHERE expires_at < ?", (_now(),))
+
+
+def _now() -> float:
+    return time.time()
+
+
+def _merge(existing: MemoryRecord, new: MemoryRecord) -> MemoryRecord:
+    """
+    One fact standing for two duplicates: the newer wording (the more
+    detailed one if both normalize to the same text), the higher
+    importance and the newer timestamp.
+    """
+    if _normalize(_searchable(new)) == _normalize(_searchable(existing)):
+        keep = new if len(new.input) > len(existing.input) else existing
+    else:
+        keep = new if new.timestamp >= existing.timestamp else existing
+    return replace(
+        keep,
+        timestamp=max(existing.timestamp, new.timestamp),
+        importance=max(existing.importance, new.importance),
+    )
+
+
+def _normalize(text: str) -> str:
+    return " ".join(_WORD.findall(text.lower()))
+
+
+def _specifics(text: str) -> FrozenSet[str]:
+    return frozenset(
+        match.rstrip(".,;:!?)]}") for match in _SPECIFIC.findall(text.lower())
+    )
+
+
+def _digest(normalized: str) -> str:
+    return hashlib.blake2b(normalized.encode(), digest_size=16).hexdigest()
+
+
+def _minhash(normalized: str, permutations: int) -> Tuple[int, ...]:
+    """
+    MinHash signature of the text's character shingles.
+
+    Each shingle is expanded into one 32-bit hash per permutation
+    with SHAKE-128, so the signature is a column-wise minimum.
+    """
+    k = _SHINGLE_SIZE
+    unpack = struct.Struct(f"<{permutations}I").unpack
+    shingles = {normalized[i : i + k] for i in range(max(len(normalized) - k + 1, 1))}
+    hashes = [
+        unpack(hashlib.shake_128(s.encode()).digest(4 * permutations))
+        for s in shingles
+    ]
+    return tuple(map(min, zip(*hashes)))
+
+
+def _similarity(a: Tuple[int, ...], b: Tuple[int, ...]) -> float:
+    """
+    Estimated Jaccard similarity of two MinHash signatures.
+    """
+    return sum(map(eq, a, b)) / len(a)
+
 
-            selected.append(r)
+def _searchable(record: MemoryRecord) -> str:
+    if record.output is None:
+        return record.input
+    return f"{record.input}\n{record.output}"
 
-            if len(selected) >= limit:
-                break
 
-        return list(reversed(selected))
+def _seq(entry: Tuple[int, MemoryRecord]) -> int:
+    return entry[0]
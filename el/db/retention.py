@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import gzip
+import json
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from el.config.consts import (
+    LOG_MAX_AGE,
+    LOG_MAX_BYTES,
+    LOG_MAX_ROWS,
+    LOG_RETENTION_INTERVAL,
+)
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    """
+    Limits for the execution log. A limit of None is not enforced.
+
+    Rows past any limit are removed oldest first; with an archive_dir
+    they are appended to a monthly archive there before removal.
+    """
+
+    max_age: Optional[float] = LOG_MAX_AGE  # seconds
+    max_rows: Optional[int] = LOG_MAX_ROWS
+    max_bytes: Optional[int] = LOG_MAX_BYTES
+    archive_dir: Optional[Path] = None
+    interval: float = LOG_RETENTION_INTERVAL  # between automatic runs
+
+
+@dataclass
+class RetentionReport:
+    archived: int = 0
+    deleted: int = 0
+    blobs_deleted: int = 0
+    bytes_before: int = 0
+    bytes_after: int = 0
+    archives: List[Path] = field(default_factory=list)
+
+
+class LogArchive:
+    """
+    Time-partitioned archive of execution log rows.
+
+    One gzip-compressed JSON-lines file per month
+    (execution_log-YYYY-MM.jsonl.gz). Appends add a gzip member,
+    so a file is never rewritten and stays readable as one stream.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self._directory = directory
+
+    def append(self, rows: List[dict]) -> List[Path]:
+        """
+        Append rows (each with an ISO "timestamp") to their month's
+        file.
+
+        Returns:
+            The files written to
+        """
+        by_month: Dict[str, List[dict]] = defaultdict(list)
+        for row in rows:
+            by_month[row["timestamp"][:7]].append(row)
+
+        self._directory.mkdir(parents=True, exist_ok=True)
+        written = []
+        for month, month_rows in sorted(by_month.items()):
+            path = self.path(month)
+            lines = "".join(json.dumps(row) + "\n" for row in month_rows)
+            with gzip.open(path, "at", encoding="utf-8", compresslevel=6) as f:
+                f.write(lines)
+            written.append(path)
+
+        return written
+
+    def path(self, month: str) -> Path:
+        return self._directory / f"execution_log-{month}.jsonl.gz"
+
+    def read(self, month: str) -> Iterator[dict]:
+        path = self.path(month)
+        if not path.exists():
+            return
+
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                yield json.loads(line)
@@ -1,36 +1,152 @@
 from __future__ import annotations
 
+import atexit
+import hashlib
+import os
+import queue
 import sqlite3
+import threading
+import time
+import zlib
+from collections import defaultdict
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Optional, List, Tuple
 from dataclasses import dataclass
 
-from el.config.consts import HISTORY_RECORDS_LIMIT
+from el.config.consts import (
+    HISTORY_RECORDS_LIMIT,
+    LOG_COMPRESS_MIN_BYTES,
+    LOG_FTS_MAX_CHARS,
+    LOG_RETENTION_CHUNK,
+    LOG_STATS_WINDOW,
+    LOG_VACUUM_PAGES,
+    LOG_WRITE_BATCH,
+)
+from el.config.utils import percentile, utc_isoformat
 from el.core.executor import CommandResult
+from el.db.retention import LogArchive, RetentionPolicy, RetentionReport
+
+# execution_log schema versions (PRAGMA user_version):
+# 0 - stdout/stderr inline as TEXT
+# 1 - stdout/stderr as hashes into output_blobs
+# 2 - binary column, filter indexes and the execution_log_fts index
+# 3 - duration, user_time, sys_time and max_rss columns
+_SCHEMA_VERSION = 3
+
+_USAGE_COLUMNS = {
+    "duration": "REAL",
+    "user_time": "REAL",
+    "sys_time": "REAL",
+    "max_rss": "INTEGER",
+}
+
+_INSERT_BLOB = """
+    INSERT OR IGNORE INTO output_blobs (hash, compressed, data)
+    VALUES (?, ?, ?)
+"""
+
+_INSERT_FTS = """
+    INSERT INTO execution_log_fts (rowid, command, output) VALUES (?, ?, ?)
+"""
+
+# Contentless FTS5 rows are removed by replaying the indexed values.
+_DELETE_FTS = """
+    INSERT INTO execution_log_fts (execution_log_fts, rowid, command, output)
+    VALUES ('delete', ?, ?, ?)
+"""
 
 
 @dataclass(frozen=True)
 class ExecutionLogRecord:
+    id: int
     timestamp: str
     command: str
     return_code: int
 
 
+@dataclass(frozen=True)
+class ExecutionOutput:
+    stdout: str
+    stderr: str
+
+
+@dataclass(frozen=True)
+class CommandUsageSummary:
+    """
+    Duration percentiles and resource use of one binary's runs.
+    """
+
+    binary: str
+    runs: int
+    failures: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    mean_cpu_ms: float  # user + sys
+    peak_rss_kib: int
+
+
 class SQLiteExecutionLogger:
     """
     Persists command execution history to SQLite.
+
+    Responsibilities:
+    - Hold one connection (WAL mode), shared by readers and the writer
+    - Queue log() calls so logging never waits on disk
+    - Write queued entries in batched transactions from a background
+      thread, draining the queue on close() or interpreter exit
+    - Read through pending writes, so history is always complete
+    - Store command output once per distinct content (output_blobs,
+      keyed by hash), compressing large outputs; output is only
+      decompressed by fetch_output()
+    - Search history by text (FTS5 over command and output), time
+      range, return code and binary, newest first, paginated by id
+    - Enforce a RetentionPolicy: archive and delete the oldest rows,
+      then give the space back with incremental vacuum; runs on its
+      own thread when a policy is given (stopped between chunks by
+      close()), or on demand
     """
 
-    def __init__(self, db_path: Path) -> None:
+    def __init__(
+        self,
+        db_path: Path,
+        batch_size: int = LOG_WRITE_BATCH,
+        retention: Optional[RetentionPolicy] = None,
+    ) -> None:
         self._db_path = db_path
+        self._batch_size = batch_size
+        self._retention = retention
+        self._next_retention = 0.0
+        self._retention_thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        # Rows below a cutoff are archived outside _lock; only one
+        # retention run may work on them at a time.
+        self._retention_lock = threading.Lock()
+        self._queue: queue.Queue[Optional[Tuple]] = queue.Queue()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
         self._init_db()
 
+        self._thread = threading.Thread(
+            target=self._run,
+            name="el-log-writer",
+            daemon=True,
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
     def _init_db(self) -> None:
         """
         Crates a table for logging
         """
-        with sqlite3.connect(self._db_path) as conn:
+        with self._lock, self._conn as conn:
+            # Takes effect for new databases; older ones are converted
+            # by the first retention run.
+            conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA temp_store=MEMORY")
             conn.execute(
                 """
                 CREATE TABLE IF NOT EXISTS execution_log (
@@ -38,53 +154,719 @@ class SQLiteExecutionLogger:
                     timestamp TEXT NOT NULL,
                     command TEXT NOT NULL,
                     return_code INTEGER NOT NULL,
-                    stdout TEXT,
-                    stderr TEXT,
-                    timed_out INTEGER NOT NULL
+                    binary TEXT,
+                    stdout_hash TEXT,
+                    stderr_hash TEXT,
+                    timed_out INTEGER NOT NULL,
+                    duration REAL,
+                    user_time REAL,
+                    sys_time REAL,
+                    max_rss INTEGER
+                )
+                """
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS output_blobs (
+                    hash TEXT PRIMARY KEY,
+                    compressed INTEGER NOT NULL,
+                    data BLOB NOT NULL
                 )
                 """
             )
 
-    def log(self, result: CommandResult) -> None:
+            # Contentless: text lives in execution_log and output_blobs.
+            conn.execute(
+                """
+                CREATE VIRTUAL TABLE IF NOT EXISTS execution_log_fts
+                USING fts5(command, output, content='')
+                """
+            )
+
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version < 1:
+                self._migrate_inline_output(conn)
+            if version < 2:
+                self._migrate_search_index(conn)
+            if version < 3:
+                columns = {
+                    row[1] for row in conn.execute("PRAGMA table_info(execution_log)")
+                }
+                for name, kind in _USAGE_COLUMNS.items():
+                    if name not in columns:
+                        conn.execute(
+                            f"ALTER TABLE execution_log ADD COLUMN {name} {kind}"
+                        )
+
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_log_timestamp "
+                "ON execution_log (timestamp)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_log_return_code "
+                "ON execution_log (return_code, id)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_log_binary "
+                "ON execution_log (binary, id)"
+            )
+            # Let retention find output blobs no row refers to.
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_log_stdout_hash "
+                "ON execution_log (stdout_hash)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_log_stderr_hash "
+                "ON execution_log (stderr_hash)"
+            )
+            conn.execute(f"PRAGMA user_version={_SCHEMA_VERSION}")
+
+    @staticmethod
+    def _migrate_inline_output(conn: sqlite3.Connection) -> None:
         """
-        Logs data into the table
+        Move stdout/stderr of version 0 tables into output_blobs.
         """
-        with sqlite3.connect(self._db_path) as conn:
-            conn.execute(
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(execution_log)")}
+        if "stdout" not in columns:
+            return
+
+        conn.execute("ALTER TABLE execution_log ADD COLUMN stdout_hash TEXT")
+        conn.execute("ALTER TABLE execution_log ADD COLUMN stderr_hash TEXT")
+
+        last_id = 0
+        while True:
+            chunk = conn.execute(
+                """
+                SELECT id, stdout, stderr
+                FROM execution_log
+                WHERE id > ?
+                ORDER BY id
+                LIMIT 1000
+                """,
+                (last_id,),
+            ).fetchall()
+            if not chunk:
+                break
+            last_id = chunk[-1][0]
+
+            blobs = {}
+            updates = [
+                (_store(blobs, stdout), _store(blobs, stderr), row_id)
+                for row_id, stdout, stderr in chunk
+            ]
+            conn.executemany(
+                _INSERT_BLOB,
+                [(h, *blob) for h, blob in blobs.items()],
+            )
+            conn.executemany(
+                "UPDATE execution_log SET stdout_hash = ?, stderr_hash = ? "
+                "WHERE id = ?",
+                updates,
+            )
+
+        try:
+            conn.execute("ALTER TABLE execution_log DROP COLUMN stdout")
+            conn.execute("ALTER TABLE execution_log DROP COLUMN stderr")
+        except sqlite3.OperationalError:
+            # SQLite < 3.35: keep the columns, but free the space.
+            conn.execute("UPDATE execution_log SET stdout = NULL, stderr = NULL")
+
+    @staticmethod
+    def _migrate_search_index(conn: sqlite3.Connection) -> None:
+        """
+        Fill binary and the full-text index for version 1 rows.
+        """
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(execution_log)")}
+        if "binary" not in columns:
+            conn.execute("ALTER TABLE execution_log ADD COLUMN binary TEXT")
+
+        last_id = 0
+        while True:
+            chunk = conn.execute(
                 """
-                INSERT INTO execution_log (
-                    timestamp,
-                    command,
-                    return_code,
-                    stdout,
-                    stderr,
-                    timed_out
-                ) VALUES (?, ?, ?, ?, ?, ?)
+                SELECT l.id, l.command, o.compressed, o.data, e.compressed, e.data
+                FROM execution_log l
+                LEFT JOIN output_blobs o ON o.hash = l.stdout_hash
+                LEFT JOIN output_blobs e ON e.hash = l.stderr_hash
+                WHERE l.id > ?
+                ORDER BY l.id
+                LIMIT 1000
                 """,
-                (
-                    datetime.utcnow().isoformat(),
-                    " ".join(result.command),
-                    result.return_code,
-                    result.stdout,
-                    result.stderr,
-                    int(result.timed_out),
-                ),
+                (last_id,),
+            ).fetchall()
+            if not chunk:
+                break
+            last_id = chunk[-1][0]
+
+            conn.executemany(
+                "UPDATE execution_log SET binary = ? WHERE id = ?",
+                [(_binary(row[1].split()), row[0]) for row in chunk],
+            )
+            conn.executemany(
+                _INSERT_FTS,
+                [
+                    (row[0], row[1], _searchable(_load(*row[2:4]), _load(*row[4:])))
+                    for row in chunk
+                ],
             )
 
+    def log(self, result: CommandResult) -> None:
+        """
+        Queues a row for the table. Never blocks.
+        """
+        self._queue.put(
+            (
+                datetime.utcnow().isoformat(),
+                " ".join(result.command),
+                _binary(result.command),
+                result.return_code,
+                result.stdout,
+                result.stderr,
+                int(result.timed_out),
+                result.duration,
+                result.user_time,
+                result.sys_time,
+                result.max_rss,
+            )
+        )
+
+    def flush(self) -> None:
+        """
+        Block until every logged entry is on disk.
+        """
+        self._queue.join()
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Write pending entries, stop the writer and close the connection.
+        A retention run in progress stops after its current chunk.
+        """
+        atexit.unregister(self.close)
+        if not self._thread.is_alive():
+            return
+        self._stopping.set()
+        self._queue.put(None)
+        self._thread.join(timeout)
+        if self._retention_thread is not None:
+            self._retention_thread.join(timeout)
+        with self._lock:
+            self._conn.close()
+
     def fetch_recent(
         self, limit: int = HISTORY_RECORDS_LIMIT
     ) -> List[ExecutionLogRecord]:
-        with sqlite3.connect(self._db_path) as conn:
-            rows = conn.execute(
+        return self.search(limit=limit)
+
+    def search(
+        self,
+        text: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        return_code: Optional[int] = None,
+        failed: Optional[bool] = None,
+        binary: Optional[str] = None,
+        before: Optional[int] = None,
+        limit: int = HISTORY_RECORDS_LIMIT,
+    ) -> List[ExecutionLogRecord]:
+        """
+        Log rows matching every given filter, newest first.
+
+        Args:
+            text: Words that must all appear in the command or its output
+            since: Inclusive lower bound, an ISO date or timestamp (UTC
+                unless it carries an offset)
+            until: Exclusive upper bound, like since
+            return_code: Exact return code
+            failed: Only non-zero (True) or zero (False) return codes
+            binary: Command name, e.g. "ip"
+            before: Keyset cursor; only rows with a smaller id
+            limit: Page size
+
+        Raises:
+            ValueError: since or until is not an ISO date or timestamp
+        """
+        # Stored timestamps are naive UTC isoformat(), compared as text.
+        since = utc_isoformat(since) if since is not None else None
+        until = utc_isoformat(until) if until is not None else None
+
+        where: List[str] = []
+        params: list = []
+
+        if text and text.split():
+            source = "execution_log_fts f JOIN execution_log l ON l.id = f.rowid"
+            where.append("execution_log_fts MATCH ?")
+            params.append(_fts_query(text))
+            order = "f.rowid"
+        else:
+            source = "execution_log l"
+            order = "l.id"
+
+        if failed is not None:
+            where.append("l.return_code != 0" if failed else "l.return_code = 0")
+
+        self.flush()
+        with self._lock:
+            # Rows are appended in time order, so time bounds become
+            # id bounds and every query walks ids newest first.
+            first = self._first_id_at(since) if since is not None else None
+            end = self._first_id_at(until) if until is not None else None
+            if since is not None and first is None:
+                return []
+
+            for clause, value in (
+                (f"{order} < ?", before),
+                (f"{order} >= ?", first),
+                (f"{order} < ?", end),
+                ("l.return_code = ?", return_code),
+                ("l.binary = ?", binary),
+            ):
+                if value is not None:
+                    where.append(clause)
+                    params.append(value)
+
+            rows = self._conn.execute(
+                f"""
+                SELECT l.id, l.timestamp, l.command, l.return_code
+                FROM {source}
+                WHERE {" AND ".join(where) or "1"}
+                ORDER BY {order} DESC
+                LIMIT ?
+                """,
+                (*params, limit),
+            ).fetchall()
+
+        return [
+            ExecutionLogRecord(id=row_id, timestamp=ts, command=cmd, return_code=rc)
+            for row_id, ts, cmd, rc in rows
+        ]
+
+    def _first_id_at(self, timestamp: str) -> Optional[int]:
+        """
+        Id of the first row logged at or after timestamp. Caller holds
+        the lock.
+        """
+        row = self._conn.execute(
+            """
+            SELECT id FROM execution_log
+            WHERE timestamp >= ?
+            ORDER BY timestamp, id
+            LIMIT 1
+            """,
+            (timestamp,),
+        ).fetchone()
+        return row[0] if row else None
+
+    def enforce_retention(
+        self, policy: Optional[RetentionPolicy] = None, vacuum: bool = True
+    ) -> RetentionReport:
+        """
+        Remove the rows policy (the logger's own by default) no longer
+        allows, oldest first and a chunk at a time, so log() never
+        waits and readers only wait for one chunk. Stops early once
+        close() was called.
+
+        Args:
+            vacuum: Allow the one-time full VACUUM that converts a
+                database created without incremental auto-vacuum
+        """
+        policy = policy or self._retention or RetentionPolicy()
+        archive = LogArchive(policy.archive_dir) if policy.archive_dir else None
+
+        self.flush()
+        with self._lock:
+            report = RetentionReport(bytes_before=self._size())
+            cutoff = self._retention_cutoff(policy)
+
+        with self._retention_lock:
+            while cutoff is not None and not self._stopping.is_set():
+                if self._expire_chunk(cutoff, archive, report):
+                    break
+
+        if not self._stopping.is_set():
+            if report.deleted:
+                self._merge_search_index()
+            self._reclaim_space(vacuum)
+
+        with self._lock:
+            report.bytes_after = self._size()
+        return report
+
+    def _retention_cutoff(self, policy: RetentionPolicy) -> Optional[int]:
+        """
+        Rows with an id below the returned one are past a limit.
+        Caller holds the lock.
+        """
+        cutoffs = []
+
+        if policy.max_age is not None:
+            oldest = datetime.utcnow() - timedelta(seconds=policy.max_age)
+            first = self._first_id_at(oldest.isoformat())
+            cutoffs.append(first if first is not None else self._max_id() + 1)
+
+        keep = policy.max_rows
+        if policy.max_bytes is not None:
+            used = self._size(used_only=True)
+            if used > policy.max_bytes:
+                rows = self._conn.execute(
+                    "SELECT count(*) FROM execution_log"
+                ).fetchone()[0]
+                # Aim below the cap so the next run is not immediate.
+                by_size = int(rows * policy.max_bytes / used * 0.9)
+                keep = by_size if keep is None else min(keep, by_size)
+
+        if keep is not None:
+            row = self._conn.execute(
+                "SELECT id FROM execution_log ORDER BY id DESC LIMIT 1 OFFSET ?",
+                (keep,),
+            ).fetchone()
+            if row is not None:
+                cutoffs.append(row[0] + 1)
+
+        return max(cutoffs) if cutoffs else None
+
+    def _expire_chunk(
+        self,
+        cutoff: int,
+        archive: Optional[LogArchive],
+        report: RetentionReport,
+    ) -> bool:
+        """
+        Archive and delete up to one chunk of rows below cutoff.
+        The lock is only held to read and to delete the rows, not
+        while they are decompressed and archived.
+
+        Returns:
+            True once no rows below cutoff remain
+        """
+        with self._lock:
+            rows = self._conn.execute(
                 """
-                SELECT timestamp, command, return_code
+                SELECT l.id, l.timestamp, l.command, l.binary, l.return_code,
+                       l.timed_out, l.stdout_hash, l.stderr_hash,
+                       o.compressed, o.data, e.compressed, e.data,
+                       l.duration, l.user_time, l.sys_time, l.max_rss
+                FROM execution_log l
+                LEFT JOIN output_blobs o ON o.hash = l.stdout_hash
+                LEFT JOIN output_blobs e ON e.hash = l.stderr_hash
+                WHERE l.id < ?
+                ORDER BY l.id
+                LIMIT ?
+                """,
+                (cutoff, LOG_RETENTION_CHUNK),
+            ).fetchall()
+        if not rows:
+            return True
+
+        expired = [
+            {
+                "id": row[0],
+                "timestamp": row[1],
+                "command": row[2],
+                "binary": row[3],
+                "return_code": row[4],
+                "timed_out": bool(row[5]),
+                "stdout": _load(*row[8:10]),
+                "stderr": _load(*row[10:12]),
+                "duration": row[12],
+                "user_time": row[13],
+                "sys_time": row[14],
+                "max_rss": row[15],
+            }
+            for row in rows
+        ]
+
+        if archive is not None:
+            for path in archive.append(expired):
+                if path not in report.archives:
+                    report.archives.append(path)
+            report.archived += len(expired)
+
+        hashes = {h for row in rows for h in row[6:8] if h}
+        with self._lock, self._conn as conn:
+            conn.executemany(
+                _DELETE_FTS,
+                [
+                    (r["id"], r["command"], _searchable(r["stdout"], r["stderr"]))
+                    for r in expired
+                ],
+            )
+            conn.executemany(
+                "DELETE FROM execution_log WHERE id = ?",
+                [(r["id"],) for r in expired],
+            )
+            for h in hashes:
+                report.blobs_deleted += conn.execute(
+                    """
+                    DELETE FROM output_blobs
+                    WHERE hash = ?
+                    AND NOT EXISTS (
+                        SELECT 1 FROM execution_log WHERE stdout_hash = ?
+                    )
+                    AND NOT EXISTS (
+                        SELECT 1 FROM execution_log WHERE stderr_hash = ?
+                    )
+                    """,
+                    (h, h, h),
+                ).rowcount
+
+        report.deleted += len(expired)
+        return len(rows) < LOG_RETENTION_CHUNK
+
+    def _merge_search_index(self) -> None:
+        """
+        Merge the FTS5 segments. Deleting from a contentless index
+        only adds tombstones; merging is what drops the rows.
+        """
+        with self._lock, self._conn as conn:
+            conn.execute(
+                "INSERT INTO execution_log_fts (execution_log_fts) VALUES ('optimize')"
+            )
+
+    def _reclaim_space(self, vacuum: bool) -> None:
+        """
+        Return free pages to the filesystem, LOG_VACUUM_PAGES at a
+        time. Databases created without incremental auto-vacuum are
+        converted by one full VACUUM if vacuum is set.
+        """
+        with self._lock:
+            if self._conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+                if vacuum:
+                    self._conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+                    self._conn.execute("VACUUM")
+                return
+
+        while not self._stopping.is_set():
+            with self._lock:
+                free = self._conn.execute("PRAGMA freelist_count").fetchone()[0]
+                if not free:
+                    return
+                self._conn.execute(
+                    f"PRAGMA incremental_vacuum({LOG_VACUUM_PAGES})"
+                ).fetchall()
+
+    def _size(self, used_only: bool = False) -> int:
+        """
+        Database size in bytes (excluding free pages if used_only).
+        Caller holds the lock.
+        """
+        pages = self._conn.execute("PRAGMA page_count").fetchone()[0]
+        if used_only:
+            pages -= self._conn.execute("PRAGMA freelist_count").fetchone()[0]
+        return pages * self._conn.execute("PRAGMA page_size").fetchone()[0]
+
+    def _max_id(self) -> int:
+        row = self._conn.execute("SELECT max(id) FROM execution_log").fetchone()
+        return row[0] or 0
+
+    def usage_summary(
+        self, window: int = LOG_STATS_WINDOW
+    ) -> List[CommandUsageSummary]:
+        """
+        Per-binary duration percentiles, CPU time and peak memory
+        over the last window measured runs, slowest p95 first.
+        """
+        self.flush()
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT binary, return_code, duration, user_time, sys_time, max_rss
                 FROM execution_log
+                WHERE duration IS NOT NULL
                 ORDER BY id DESC
                 LIMIT ?
                 """,
-                (limit,),
+                (window,),
             ).fetchall()
-            return [
-                ExecutionLogRecord(timestamp=ts, command=cmd, return_code=rc)
-                for ts, cmd, rc in rows
-            ]
+
+        by_binary = defaultdict(list)
+        for row in rows:
+            by_binary[row[0] or ""].append(row[1:])
+
+        summaries = []
+        for binary, runs in by_binary.items():
+            durations = sorted(run[1] * 1000 for run in runs)
+            summaries.append(
+                CommandUsageSummary(
+                    binary=binary,
+                    runs=len(runs),
+                    failures=sum(1 for run in runs if run[0] != 0),
+                    p50_ms=percentile(durations, 50),
+                    p95_ms=percentile(durations, 95),
+                    p99_ms=percentile(durations, 99),
+                    mean_cpu_ms=sum((run[2] or 0) + (run[3] or 0) for run in runs)
+                    * 1000
+                    / len(runs),
+                    peak_rss_kib=max(run[4] or 0 for run in runs),
+                )
+            )
+
+        summaries.sort(key=lambda s: s.p95_ms, reverse=True)
+        return summaries
+
+    def fetch_output(self, log_id: int) -> Optional[ExecutionOutput]:
+        """
+        The stdout/stderr of one execution_log row, decompressed.
+        """
+        self.flush()
+        with self._lock:
+            row = self._conn.execute(
+                """
+                SELECT o.compressed, o.data, e.compressed, e.data
+                FROM execution_log l
+                LEFT JOIN output_blobs o ON o.hash = l.stdout_hash
+                LEFT JOIN output_blobs e ON e.hash = l.stderr_hash
+                WHERE l.id = ?
+                """,
+                (log_id,),
+            ).fetchone()
+
+        if row is None:
+            return None
+        return ExecutionOutput(stdout=_load(*row[:2]), stderr=_load(*row[2:]))
+
+    def _run(self) -> None:
+        stopping = False
+        self._maybe_enforce_retention()
+
+        while not stopping:
+            item = self._queue.get()
+            batch: List[Tuple] = []
+
+            # Entries logged while the previous batch was being
+            # written share one transaction.
+            while item is not None:
+                batch.append(item)
+                if len(batch) >= self._batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            stopping = item is None
+
+            try:
+                if batch:
+                    self._write(batch)
+            except sqlite3.Error:
+                # Logging is best effort and must never take the
+                # writer down.
+                pass
+            finally:
+                for _ in range(len(batch) + int(stopping)):
+                    self._queue.task_done()
+
+            if not stopping:
+                self._maybe_enforce_retention()
+
+    def _maybe_enforce_retention(self) -> None:
+        if self._retention is None or time.monotonic() < self._next_retention:
+            return
+        if self._stopping.is_set() or (
+            self._retention_thread is not None and self._retention_thread.is_alive()
+        ):
+            return
+
+        self._next_retention = time.monotonic() + self._retention.interval
+        # Off the writer thread, so entries logged meanwhile are still
+        # written (and flushed readers served) between chunks.
+        self._retention_thread = threading.Thread(
+            target=self._run_retention,
+            name="el-log-retention",
+            daemon=True,
+        )
+        self._retention_thread.start()
+
+    def _run_retention(self) -> None:
+        try:
+            # A full VACUUM cannot be interrupted; leave it to an
+            # explicit run.
+            self.enforce_retention(vacuum=False)
+        except (sqlite3.Error, OSError):
+            # Retried at the next interval.
+            pass
+
+    def _write(self, batch: List[Tuple]) -> None:
+        blobs = {}
+        rows = [
+            (
+                (ts, cmd, binary, rc, _store(blobs, out), _store(blobs, err), *rest),
+                _searchable(out, err),
+            )
+            for ts, cmd, binary, rc, out, err, *rest in batch
+        ]
+
+        with self._lock, self._conn as conn:
+            conn.executemany(
+                _INSERT_BLOB,
+                [(h, *blob) for h, blob in blobs.items()],
+            )
+            for row, output in rows:
+                log_id = conn.execute(
+                    """
+                    INSERT INTO execution_log (
+                        timestamp,
+                        command,
+                        binary,
+                        return_code,
+                        stdout_hash,
+                        stderr_hash,
+                        timed_out,
+                        duration,
+                        user_time,
+                        sys_time,
+                        max_rss
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    row,
+                ).lastrowid
+                conn.execute(_INSERT_FTS, (log_id, row[1], output))
+
+
+def _store(blobs: dict, text: Optional[str]) -> Optional[str]:
+    """
+    Add text to blobs (hash -> (compressed, data)) and return its
+    hash. Empty output is not stored.
+    """
+    if not text:
+        return None
+
+    data = text.encode()
+    key = hashlib.blake2b(data, digest_size=16).hexdigest()
+    if key not in blobs:
+        compressed = 0
+        if len(data) >= LOG_COMPRESS_MIN_BYTES:
+            packed = zlib.compress(data)
+            if len(packed) < len(data):
+                data, compressed = packed, 1
+        blobs[key] = (compressed, data)
+    return key
+
+
+def _binary(command: List[str]) -> Optional[str]:
+    return os.path.basename(command[0]) if command else None
+
+
+def _searchable(stdout: Optional[str], stderr: Optional[str]) -> str:
+    """
+    The indexed output text: stdout and stderr, capped so huge
+    outputs do not dominate the index.
+    """
+    return f"{stdout or ''}\n{stderr or ''}"[:LOG_FTS_MAX_CHARS]
+
+
+def _fts_query(text: str) -> str:
+    """
+    Quote each word, so text is matched literally (all words, any
+    order) instead of parsed as FTS5 query syntax.
+    """
+    words = text.split()
+    return " ".join('"' + word.replace('"', '""') + '"' for word in words)
+
+
+def _load(compressed: Optional[int], data: Optional[bytes]) -> str:
+    if data is None:
+        return ""
+    if compressed:
+        data = zlib.decompress(data)
+    return data.decode()
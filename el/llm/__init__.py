@@ -1 +1 @@
-from el.llm import client, prompts, schemas
+from el.llm import cache, client, pool, prompts, repair, schemas, stream, telemetry, tokens
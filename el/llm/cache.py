@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional, Tuple
+
+from el.config.consts import (
+    LLM_CACHE_DISK_ENTRIES,
+    LLM_CACHE_EVICT_INTERVAL,
+    LLM_CACHE_MEMORY_ENTRIES,
+    LLM_CACHE_TTL,
+)
+
+# Payload fields that change how a response is delivered, not what it is.
+_TRANSPORT_FIELDS = {"stream", "keep_alive"}
+
+
+@dataclass
+class CacheStats:
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hits(self) -> int:
+        return self.memory_hits + self.disk_hits
+
+
+class ResponseCache:
+    """
+    Two-tier cache for deterministic (temperature 0) LLM responses.
+
+    - Keyed on a hash of the full request payload
+    - In-memory LRU in front of a persistent SQLite table, held open
+      on one connection (WAL mode)
+    - Entries expire after ttl seconds; both tiers are size capped.
+      Expired entries are never served; the disk tier is pruned every
+      evict_interval inserts, so it may briefly exceed its cap
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        memory_entries: int = LLM_CACHE_MEMORY_ENTRIES,
+        disk_entries: int = LLM_CACHE_DISK_ENTRIES,
+        ttl: Optional[float] = LLM_CACHE_TTL,
+        evict_interval: int = LLM_CACHE_EVICT_INTERVAL,
+    ) -> None:
+        self._db_path = db_path
+        self._memory_entries = memory_entries
+        self._disk_entries = disk_entries
+        self._ttl = ttl
+        self._evict_interval = evict_interval
+        self._inserts = 0
+        self._lru: OrderedDict[str, Tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self.stats = CacheStats()
+
+        if self._db_path is not None:
+            self._conn = sqlite3.connect(self._db_path, check_same_thread=False)
+            self._init_db()
+
+    def _init_db(self) -> None:
+        """
+        Creates the persistent cache table
+        """
+        with self._db_lock, self._conn as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS llm_cache (
+                    key TEXT PRIMARY KEY,
+                    response TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_llm_cache_accessed "
+                "ON llm_cache (accessed_at)"
+            )
+
+    @staticmethod
+    def key(payload: dict[str, Any]) -> str:
+        material = {k: v for k, v in payload.items() if k not in _TRANSPORT_FIELDS}
+        encoded = json.dumps(material, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    def get(self, payload: dict[str, Any]) -> Optional[str]:
+        key = self.key(payload)
+        now = time.time()
+
+        with self._lock:
+            entry = self._lru.get(key)
+            if entry is not None:
+                created_at, response = entry
+                if not self._expired(created_at, now):
+                    self._lru.move_to_end(key)
+                    self.stats.memory_hits += 1
+                    return response
+                del self._lru[key]
+                self.stats.evictions += 1
+
+        if self._conn is not None:
+            with self._db_lock, self._conn as conn:
+                row = conn.execute(
+                    "SELECT response, created_at FROM llm_cache WHERE key = ?",
+                    (key,),
+                ).fetchone()
+
+                if row is not None:
+                    response, created_at = row
+                    if not self._expired(created_at, now):
+                        conn.execute(
+                            "UPDATE llm_cache SET accessed_at = ? WHERE key = ?",
+                            (now, key),
+                        )
+                        with self._lock:
+                            self._remember(key, created_at, response)
+                            self.stats.disk_hits += 1
+                        return response
+
+                    conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                    with self._lock:
+                        self.stats.evictions += 1
+
+        with self._lock:
+            self.stats.misses += 1
+        return None
+
+    def put(self, payload: dict[str, Any], response: str) -> None:
+        key = self.key(payload)
+        now = time.time()
+
+        with self._lock:
+            self._remember(key, now, response)
+
+        if self._conn is None:
+            return
+
+        with self._db_lock, self._conn as conn:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO llm_cache (
+                    key,
+                    response,
+                    created_at,
+                    accessed_at
+                ) VALUES (?, ?, ?, ?)
+                """,
+                (key, response, now, now),
+            )
+            self._inserts += 1
+            if self._inserts < self._evict_interval:
+                return
+            self._inserts = 0
+            evicted = self._evict(conn, now)
+
+        if evicted > 0:
+            with self._lock:
+                self.stats.evictions += evicted
+
+    def clear(self) -> None:
+        with self._lock:
+            self._lru.clear()
+
+        if self._conn is not None:
+            with self._db_lock, self._conn as conn:
+                conn.execute("DELETE FROM llm_cache")
+
+    def close(self) -> None:
+        if self._conn is not None:
+            with self._db_lock:
+                self._conn.close()
+                self._conn = None
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> int:
+        """
+        Drop expired entries, then the least recently used ones past
+        disk_entries. Caller holds the db lock.
+        """
+        evicted = 0
+        if self._ttl is not None:
+            evicted += conn.execute(
+                "DELETE FROM llm_cache WHERE created_at < ?",
+                (now - self._ttl,),
+            ).rowcount
+        evicted += conn.execute(
+            """
+            DELETE FROM llm_cache WHERE key IN (
+                SELECT key FROM llm_cache
+                ORDER BY accessed_at DESC
+                LIMIT -1 OFFSET ?
+            )
+            """,
+            (self._disk_entries,),
+        ).rowcount
+        return evicted
+
+    def _remember(self, key: str, created_at: float, response: str) -> None:
+        self._lru[key] = (created_at, response)
+        self._lru.move_to_end(key)
+
+        while len(self._lru) > self._memory_entries:
+            self._lru.popitem(last=False)
+            self.stats.evictions += 1
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return self._ttl is not None and now - created_at > self._ttl
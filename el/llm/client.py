@@ -1,92 +1,224 @@
 from __future__ import annotations
 
+import asyncio
 import httpx
+import itertools
 import json
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    TimeoutError as FutureTimeoutError,
+    wait,
+)
+from contextlib import AsyncExitStack, ExitStack, contextmanager
+from typing import (
+    Any,
+    AsyncIterator,
+    Iterable,
+    Iterator,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
 from pydantic import BaseModel, ValidationError, TypeAdapter
 
-from el.config.consts import BASE_URL, LLM_MODEL, LLM_TIMEOUT
-from el.llm.prompts import SYSTEM_PROMPT
-from el.llm.schemas import FactExtractionRequest, LLMRequest
+from el.config.consts import (
+    BASE_URL,
+    LLM_HEDGE_AFTER,
+    LLM_KEEP_ALIVE,
+    LLM_KEEPALIVE_EXPIRY,
+    LLM_MAX_CONNECTIONS,
+    LLM_MAX_KEEPALIVE_CONNECTIONS,
+    LLM_MODEL,
+    LLM_STREAM,
+    LLM_STRUCTURED_OUTPUT,
+    LLM_TIMEOUT,
+)
+from el.llm.cache import ResponseCache
+from el.llm.pool import Backend, BackendPool, retryable
+from el.llm.prompts import STRUCTURED_SYSTEM_PROMPT, SYSTEM_PROMPT
+from el.llm.repair import adapter_for, coerce_lists, repair_json
+from el.llm.schemas import FactExtractionRequest, LLMRequest, format_schema
+from el.llm.stream import IncrementalJSONDecoder
+from el.llm.telemetry import LLMCall, LLMCallKind, LLMTelemetry
+from el.llm.tokens import PromptEvalStats
 
 
 class LLMError(Exception):
     pass
 
 
-class LLMClient:
+def _discard_stream(future: Future) -> None:
     """
-    Thin wrapper over Ollama.
-    Responsible ONLY for:
-    - prompting
-    - parsing JSON
-    - validating schema
+    Close the stream a losing hedged request opened, if it did.
+    """
+    if not future.cancelled() and future.exception() is None:
+        future.result()[1].close()
+
+
+async def _prepend(first: str, lines: AsyncIterator[str]) -> AsyncIterator[str]:
+    yield first
+    async for line in lines:
+        yield line
+
+
+def _limits(
+    max_connections: int,
+    max_keepalive_connections: int,
+    keepalive_expiry: float,
+) -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_keepalive_connections,
+        keepalive_expiry=keepalive_expiry,
+    )
+
+
+class _BaseLLMClient:
+    """
+    Transport-agnostic half of the Ollama clients.
+
+    Builds payloads, consults the response cache and parses
+    responses. Subclasses only move bytes.
+
+    Prompts are laid out as a stable system prefix (SYSTEM_PROMPT
+    plus any static prefix such as the capability manifest) followed
+    by the per-turn part, so Ollama's KV cache can skip re-evaluating
+    the prefix. keep_alive keeps the model resident between turns.
+
+    In structured mode the JSON Schema of the expected pydantic type
+    is sent as Ollama's format, so decoding is grammar-constrained
+    and the prompts no longer need to describe the output shape.
+
+    Requests go to the best backend of a BackendPool and fail over
+    to the next one on connection or server errors. With hedge_after
+    set, a request still unanswered after that many seconds is also
+    sent to a second backend and the first answer wins; streamed
+    requests race to the first chunk, then read only the winner.
+
+    Every call that goes to a backend (cache hits do not) is timed
+    and, given a telemetry store, recorded together with Ollama's
+    own timing and token counts.
     """
 
     def __init__(
         self,
-        model: str = LLM_MODEL,
-        base_url: str = BASE_URL,
-        timeout: int = LLM_TIMEOUT,
+        model: str,
+        stream: bool,
+        cache: Optional[ResponseCache],
+        keep_alive: str,
+        structured: bool,
+        pool: BackendPool,
+        hedge_after: Optional[float],
+        telemetry: Optional[LLMTelemetry],
+        prompt_eval: Optional[PromptEvalStats],
     ) -> None:
+        self._pool = pool
+        self._telemetry = telemetry
+        self._hedge_after = hedge_after
         self._model = model
-        self._url = f"{base_url}/api/generate"
-        self._timeout = timeout
+        self._stream = stream
+        self._cache = cache
+        self._keep_alive = keep_alive
+        self._structured = structured
+        self._formats: dict[Any, Any] = {}
+        self.prompt_eval = prompt_eval or PromptEvalStats()
+
+    @property
+    def cache(self) -> Optional[ResponseCache]:
+        return self._cache
+
+    @property
+    def structured(self) -> bool:
+        return self._structured
+
+    @property
+    def pool(self) -> BackendPool:
+        return self._pool
 
-    def generate(self, user_input: str, schema: LLMRequest, context: str) -> BaseModel:
+    @property
+    def telemetry(self) -> Optional[LLMTelemetry]:
+        return self._telemetry
+
+    def _hedging(self) -> bool:
+        return self._hedge_after is not None and len(self._pool) > 1
+
+    def _format(self, schema: Any) -> Any:
         """
-        Convert user input into a structured request.
+        Ollama format for a schema, cached for this client's model.
+        """
+        if not self._structured:
+            return "json"
 
-        Raises:
-            LLMError
+        fmt = self._formats.get(schema)
+        if fmt is None:
+            fmt = self._formats[schema] = format_schema(schema)
+        return fmt
+
+    def _cache_get(self, payload: dict) -> Optional[str]:
+        if self._cache is None:
+            return None
+        return self._cache.get(payload)
+
+    def _cache_put(self, payload: dict, response: str) -> None:
+        if self._cache is not None:
+            self._cache.put(payload, response)
+
+    def _system(self, prefix: str) -> str:
+        system = STRUCTURED_SYSTEM_PROMPT if self._structured else SYSTEM_PROMPT
+        if not prefix:
+            return system
+        return f"{system}\n{prefix}"
+
+    def _warm_payload(self, prefix: str) -> dict[str, Any]:
         """
-        prompt = f"""
-{SYSTEM_PROMPT}
+        Load the model and evaluate the system prefix so the first
+        real turn starts from a warm KV cache.
+        """
+        return {
+            "model": self._model,
+            "system": self._system(prefix),
+            "prompt": "User input:",
+            "stream": False,
+            "keep_alive": self._keep_alive,
+            "options": {"temperature": 0, "num_predict": 1},
+        }
 
+    def _generate_payload(
+        self,
+        user_input: str,
+        context: str,
+        schema: Any,
+        prefix: str = "",
+    ) -> dict[str, Any]:
+        prompt = f"""
 {context}
 
 User input:
 {user_input}
 """
 
-        payload = {
+        return {
             "model": self._model,
+            "system": self._system(prefix),
             "prompt": prompt,
-            "stream": False,
-            "format": "json",
+            "stream": self._stream,
+            "keep_alive": self._keep_alive,
+            "format": self._format(schema),
             "options": {
                 "temperature": 0,
             },
         }
 
-        try:
-            resp = httpx.post(
-                self._url,
-                json=payload,
-                timeout=self._timeout,
-            )
-            resp.raise_for_status()
-        except Exception as e:
-            raise LLMError(f"Ollama execution failed: {e}") from e
-
-        data = resp.json()
-
-        if "response" not in data:
-            raise LLMError(f"Invalid Ollama response: {data}")
-
-        try:
-            parsed = json.loads(data["response"])
-        except json.JSONDecodeError as e:
-            raise LLMError(f"LLM returned invalid JSON:\n{data['response']}") from e
-
-        print(parsed)
-        try:
-            adapter = TypeAdapter(schema)
-            return adapter.validate_python(parsed)
-        except ValidationError as e:
-            raise LLMError(f"Schema validation failed:\n{e}") from e
+    def _facts_payload(self, turns: Iterable[Tuple[str, str]]) -> dict[str, Any]:
+        exchanges = "\n\n".join(
+            f"User input:\n{user_input}\n\nOutput:\n{output}"
+            for user_input, output in turns
+        )
 
-    def extract_facts(self, user_input: str, output: str) -> list[str]:
         prompt = f"""
 Extract durable facts worth remembering.
 
@@ -96,48 +228,871 @@ Rules:
 - No transient output
 - If none, return empty list
 
-User input:
-{user_input}
-
-Output:
-{output}
+{exchanges}
+"""
 
+        if not self._structured:
+            prompt += """
 Return JSON:
-{{ "facts": [] }}
+{ "facts": [] }
 """
 
-        payload = {
+        return {
             "model": self._model,
             "prompt": prompt,
             "stream": False,
-            "format": "json",
+            "keep_alive": self._keep_alive,
+            "format": self._format(FactExtractionRequest),
             "options": {
                 "temperature": 0,
             },
         }
 
+    def _text_payload(self, prompt: str) -> dict[str, Any]:
+        return {
+            "model": self._model,
+            "prompt": prompt,
+            "stream": False,
+            "keep_alive": self._keep_alive,
+            "options": {"temperature": 0},
+        }
+
+    def _cached_request(
+        self, payload: dict, adapter: TypeAdapter
+    ) -> Optional[BaseModel]:
+        cached = self._cache_get(payload)
+        if cached is None:
+            return None
+
+        try:
+            return adapter.validate_json(cached)
+        except ValidationError:
+            return None
+
+    def _store_request(
+        self, payload: dict, adapter: TypeAdapter, result: BaseModel
+    ) -> BaseModel:
+        self._cache_put(payload, adapter.dump_json(result).decode())
+        return result
+
+    @contextmanager
+    def _track_call(self, kind: LLMCallKind) -> Iterator[LLMCall]:
+        """
+        Time one call to Ollama and record it in telemetry.
+        """
+        call = LLMCall(kind=kind, model=self._model)
+        started = time.perf_counter()
+        success = False
+
         try:
-            resp = httpx.post(self._url, json=payload, timeout=self._timeout)
+            yield call
+            success = True
+        finally:
+            if self._telemetry is not None:
+                latency_ms = (time.perf_counter() - started) * 1000
+                self._telemetry.record(call, latency_ms, success)
+
+    def _observe(self, call: LLMCall, payload: dict, data: dict) -> None:
+        """
+        Take note of a final Ollama response object.
+        """
+        call.data = data
+        self.prompt_eval.record(
+            payload.get("system", ""), payload.get("prompt", ""), data
+        )
+
+    def _receive(
+        self, call: LLMCall, payload: dict, resp: httpx.Response
+    ) -> dict:
+        call.backend = str(resp.url).removesuffix("/api/generate")
+        data = json.loads(resp.content)
+        self._observe(call, payload, data)
+        return data
+
+    def _decode(self, raw: str | bytes, adapter: TypeAdapter) -> Any:
+        """
+        Validate model output straight from its JSON text. On failure,
+        try to repair it locally before giving up, since a retry costs
+        a full inference.
+
+        Raises:
+            LLMError
+        """
+        try:
+            return adapter.validate_json(raw)
+        except ValidationError as e:
+            error = e
+
+        parsed = repair_json(raw)
+        if parsed is None:
+            raise LLMError(f"LLM returned invalid JSON:\n{raw}") from error
+
+        try:
+            return adapter.validate_python(parsed)
+        except ValidationError as e:
+            error = e
+
+        coerced = coerce_lists(parsed, error)
+        if coerced is None:
+            raise LLMError(f"Schema validation failed:\n{error}") from error
+
+        try:
+            return adapter.validate_python(coerced)
+        except ValidationError as e:
+            raise LLMError(f"Schema validation failed:\n{e}") from e
+
+    def _parse_response(self, data: dict, adapter: TypeAdapter) -> BaseModel:
+        if "response" not in data:
+            raise LLMError(f"Invalid Ollama response: {data}")
+
+        return self._decode(data["response"], adapter)
+
+    def _consume_stream_line(
+        self,
+        call: LLMCall,
+        payload: dict,
+        line: str,
+        decoder: IncrementalJSONDecoder,
+        adapter: TypeAdapter,
+    ) -> Tuple[Optional[BaseModel], bool]:
+        """
+        Feed one NDJSON line to the decoder.
+
+        Returns:
+            (request, finished) - request is set as soon as the
+            decoded prefix validates against the schema.
+        """
+        if not line:
+            return None, False
+
+        chunk = json.loads(line)
+
+        if chunk.get("done"):
+            self._observe(call, payload, chunk)
+
+        if decoder.feed(chunk.get("response", "")):
+            partial = decoder.partial_text()
+            if partial is not None:
+                try:
+                    return adapter.validate_json(partial), True
+                except ValidationError:
+                    pass
+
+        return None, decoder.complete or bool(chunk.get("done"))
+
+    def _finish_stream(
+        self, decoder: IncrementalJSONDecoder, adapter: TypeAdapter
+    ) -> BaseModel:
+        return self._decode(decoder.raw, adapter)
+
+    def _parse_facts(self, raw: str) -> list[str]:
+        return self._decode(raw, adapter_for(FactExtractionRequest)).facts
+
+
+class LLMClient(_BaseLLMClient):
+    """
+    Thin wrapper over Ollama.
+    Responsible ONLY for:
+    - prompting
+    - parsing JSON
+    - validating schema
+
+    Owns a single pooled, keep-alive HTTP connection to Ollama
+    that is reused for every call until close().
+    """
+
+    def __init__(
+        self,
+        model: str = LLM_MODEL,
+        base_url: str = BASE_URL,
+        base_urls: Optional[Sequence[str]] = None,
+        pool: Optional[BackendPool] = None,
+        hedge_after: Optional[float] = LLM_HEDGE_AFTER,
+        timeout: int = LLM_TIMEOUT,
+        max_connections: int = LLM_MAX_CONNECTIONS,
+        max_keepalive_connections: int = LLM_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float = LLM_KEEPALIVE_EXPIRY,
+        stream: bool = LLM_STREAM,
+        cache: Optional[ResponseCache] = None,
+        keep_alive: str = LLM_KEEP_ALIVE,
+        structured: bool = LLM_STRUCTURED_OUTPUT,
+        telemetry: Optional[LLMTelemetry] = None,
+        prompt_eval: Optional[PromptEvalStats] = None,
+    ) -> None:
+        super().__init__(
+            model=model,
+            stream=stream,
+            cache=cache,
+            keep_alive=keep_alive,
+            structured=structured,
+            pool=pool or BackendPool(base_urls or [base_url]),
+            hedge_after=hedge_after,
+            telemetry=telemetry,
+            prompt_eval=prompt_eval,
+        )
+        self._timeout = timeout
+        self._hedger = (
+            ThreadPoolExecutor(thread_name_prefix="el-hedge")
+            if self._hedging()
+            else None
+        )
+        self._http = httpx.Client(
+            timeout=timeout,
+            limits=_limits(
+                max_connections, max_keepalive_connections, keepalive_expiry
+            ),
+        )
+
+    def close(self) -> None:
+        """
+        Release pooled connections.
+        """
+        if self._hedger is not None:
+            self._hedger.shutdown(wait=False, cancel_futures=True)
+        self._http.close()
+
+    def __enter__(self) -> LLMClient:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _send(self, backend: Backend, payload: dict) -> httpx.Response:
+        with self._pool.track(backend):
+            resp = self._http.post(backend.generate_url, json=payload)
             resp.raise_for_status()
-            data = resp.json()
-            raw_json = json.loads(data.get("response", "{}"))
-            req = FactExtractionRequest.model_validate(raw_json)
-            return req.facts
+            return resp
+
+    def _post(self, payload: dict) -> httpx.Response:
+        if self._hedger is not None:
+            return self._post_hedged(payload)
+        return self._post_failover(payload)
+
+    def _post_failover(
+        self, payload: dict, exclude: Iterable[str] = ()
+    ) -> httpx.Response:
+        error: Optional[BaseException] = None
+
+        for backend in self._pool.candidates(exclude):
+            try:
+                return self._send(backend, payload)
+            except Exception as e:
+                if not retryable(e):
+                    raise
+                error = e
+
+        raise error or LLMError("No Ollama backend available")
+
+    def _post_hedged(self, payload: dict) -> httpx.Response:
+        primary = self._pool.select()
+        first = self._hedger.submit(self._send, primary, payload)
+
+        try:
+            return first.result(timeout=self._hedge_after)
+        except FutureTimeoutError:
+            pass
+        except Exception as e:
+            if not retryable(e):
+                raise
+            return self._post_failover(payload, exclude=[primary.url])
+
+        secondary = self._pool.select(exclude=[primary.url])
+        pending = {first, self._hedger.submit(self._send, secondary, payload)}
+        error: Optional[BaseException] = None
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                error = future.exception()
+
+        raise error
+
+    def warm(self, prefix: str = "") -> None:
+        """
+        Load the model (and evaluate the static prefix) on every
+        backend ahead of the first turn. Best effort.
+        """
+        payload = self._warm_payload(prefix)
+
+        for backend in self._pool.backends:
+            try:
+                resp = self._send(backend, payload)
+                self.prompt_eval.record_cold(
+                    payload["system"], payload["prompt"], resp.json()
+                )
+            except Exception:
+                pass
+
+    def generate(
+        self,
+        user_input: str,
+        schema: LLMRequest,
+        context: str,
+        prefix: str = "",
+        kind: LLMCallKind = LLMCallKind.GENERATE,
+    ) -> BaseModel:
+        """
+        Convert user input into a structured request.
+
+        Args:
+            prefix: Static prompt section shared across calls
+                    (kept ahead of context for KV-cache reuse)
+            kind: What the call is for, as recorded in telemetry
+
+        Raises:
+            LLMError
+        """
+        payload = self._generate_payload(user_input, context, schema, prefix)
+        adapter = adapter_for(schema)
+
+        cached = self._cached_request(payload, adapter)
+        if cached is not None:
+            return cached
+
+        with self._track_call(kind) as call:
+            if self._stream and self._hedger is not None:
+                result = self._generate_streaming_hedged(call, payload, adapter)
+            elif self._stream:
+                result = self._generate_streaming(call, payload, adapter)
+            else:
+                result = self._generate_blocking(call, payload, adapter)
+
+        return self._store_request(payload, adapter, result)
+
+    def _generate_blocking(
+        self, call: LLMCall, payload: dict, adapter: TypeAdapter
+    ) -> BaseModel:
+        try:
+            resp = self._post(payload)
+        except Exception as e:
+            raise LLMError(f"Ollama execution failed: {e}") from e
+
+        data = self._receive(call, payload, resp)
+        return self._parse_response(data, adapter)
+
+    def _generate_streaming(
+        self,
+        call: LLMCall,
+        payload: dict,
+        adapter: TypeAdapter,
+        exclude: Iterable[str] = (),
+    ) -> BaseModel:
+        """
+        Read Ollama's NDJSON token stream and return as soon as the
+        decoded prefix validates against the schema.
+
+        Leaving the stream early closes the connection, which also
+        stops Ollama from generating the remaining tokens.
+        """
+        error: Optional[BaseException] = None
+
+        for backend in self._pool.candidates(exclude):
+            decoder = IncrementalJSONDecoder()
+            call.backend = backend.url
+
+            try:
+                with self._pool.track(backend), self._http.stream(
+                    "POST", backend.generate_url, json=payload
+                ) as resp:
+                    resp.raise_for_status()
+
+                    for line in resp.iter_lines():
+                        result, finished = self._consume_stream_line(
+                            call, payload, line, decoder, adapter
+                        )
+                        if result is not None:
+                            return result
+                        if finished:
+                            break
+            except Exception as e:
+                # Only fail over before any output was consumed.
+                if decoder.text or not retryable(e):
+                    raise LLMError(f"Ollama execution failed: {e}") from e
+                error = e
+            else:
+                return self._finish_stream(decoder, adapter)
+
+        raise LLMError(f"Ollama execution failed: {error}") from error
+
+    def _generate_streaming_hedged(
+        self, call: LLMCall, payload: dict, adapter: TypeAdapter
+    ) -> BaseModel:
+        """
+        _generate_streaming, with the stream also opened on a second
+        backend when the first has sent nothing after hedge_after
+        seconds. The first stream to deliver a chunk is read; the
+        other is closed.
+        """
+        primary = self._pool.select()
+        first = self._hedger.submit(self._open_stream, primary, payload)
+
+        try:
+            winner = first.result(timeout=self._hedge_after)
+        except FutureTimeoutError:
+            winner = None
+        except Exception as e:
+            if not retryable(e):
+                raise LLMError(f"Ollama execution failed: {e}") from e
+            return self._generate_streaming(
+                call, payload, adapter, exclude=[primary.url]
+            )
+
+        secondary = self._pool.select(exclude=[primary.url])
+        if winner is None and secondary is not None:
+            pending = {
+                first,
+                self._hedger.submit(self._open_stream, secondary, payload),
+            }
+            error: Optional[BaseException] = None
+
+            while pending and winner is None:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future.exception() is not None:
+                        error = future.exception()
+                    elif winner is None:
+                        winner = future.result()
+                    else:
+                        _discard_stream(future)
+
+            # The loser may still be waiting for its first chunk.
+            for future in pending:
+                future.add_done_callback(_discard_stream)
+
+            if winner is None:
+                raise LLMError(f"Ollama execution failed: {error}") from error
+        elif winner is None:
+            try:
+                winner = first.result()
+            except Exception as e:
+                raise LLMError(f"Ollama execution failed: {e}") from e
+
+        backend, stack, lines = winner
+        decoder = IncrementalJSONDecoder()
+        call.backend = backend.url
+
+        try:
+            with stack:
+                for line in lines:
+                    result, finished = self._consume_stream_line(
+                        call, payload, line, decoder, adapter
+                    )
+                    if result is not None:
+                        return result
+                    if finished:
+                        break
+        except Exception as e:
+            raise LLMError(f"Ollama execution failed: {e}") from e
+
+        return self._finish_stream(decoder, adapter)
+
+    def _open_stream(
+        self, backend: Backend, payload: dict
+    ) -> Tuple[Backend, ExitStack, Iterator[str]]:
+        """
+        Start a streamed request and wait for its first line.
+
+        Returns:
+            (backend, stack, lines) - closing stack closes the
+            response; lines starts with the line already received.
+        """
+        stack = ExitStack()
+        try:
+            stack.enter_context(self._pool.track(backend))
+            resp = stack.enter_context(
+                self._http.stream("POST", backend.generate_url, json=payload)
+            )
+            resp.raise_for_status()
+            lines = resp.iter_lines()
+            first = next(lines, "")
+        except BaseException as e:
+            stack.__exit__(type(e), e, e.__traceback__)
+            raise
+
+        return backend, stack, itertools.chain([first], lines)
+
+    def extract_facts(self, user_input: str, output: str) -> list[str]:
+        return self.extract_facts_batch([(user_input, output)])
+
+    def extract_facts_batch(self, turns: Iterable[Tuple[str, str]]) -> list[str]:
+        """
+        Extract facts from several (user_input, output) turns
+        with a single inference.
+        """
+        payload = self._facts_payload(turns)
+
+        try:
+            cached = self._cache_get(payload)
+            if cached is not None:
+                return self._parse_facts(cached)
+
+            with self._track_call(LLMCallKind.EXTRACT_FACTS) as call:
+                data = self._receive(call, payload, self._post(payload))
+            raw = data.get("response", "{}")
+            facts = self._parse_facts(raw)
+            self._cache_put(payload, raw)
+            return facts
         except Exception:
             return []
 
     def generate_text(self, prompt: str) -> str:
-        payload = {
-            "model": self._model,
-            "prompt": prompt,
-            "stream": False,
-            "options": {"temperature": 0},
-        }
+        payload = self._text_payload(prompt)
+
+        cached = self._cache_get(payload)
+        if cached is not None:
+            return cached
+
+        try:
+            with self._track_call(LLMCallKind.GENERATE_TEXT) as call:
+                data = self._receive(call, payload, self._post(payload))
+            text = data.get("response", "").strip()
+        except Exception as e:
+            raise LLMError(f"Ollama execution failed: {e}") from e
+
+        self._cache_put(payload, text)
+        return text
+
+
+class AsyncLLMClient(_BaseLLMClient):
+    """
+    asyncio counterpart of LLMClient built on httpx.AsyncClient.
+
+    Same prompts, cache and validation; every call is awaitable
+    so independent LLM work can run concurrently.
+    """
+
+    def __init__(
+        self,
+        model: str = LLM_MODEL,
+        base_url: str = BASE_URL,
+        base_urls: Optional[Sequence[str]] = None,
+        pool: Optional[BackendPool] = None,
+        hedge_after: Optional[float] = LLM_HEDGE_AFTER,
+        timeout: int = LLM_TIMEOUT,
+        max_connections: int = LLM_MAX_CONNECTIONS,
+        max_keepalive_connections: int = LLM_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float = LLM_KEEPALIVE_EXPIRY,
+        stream: bool = LLM_STREAM,
+        cache: Optional[ResponseCache] = None,
+        keep_alive: str = LLM_KEEP_ALIVE,
+        structured: bool = LLM_STRUCTURED_OUTPUT,
+        telemetry: Optional[LLMTelemetry] = None,
+        prompt_eval: Optional[PromptEvalStats] = None,
+    ) -> None:
+        super().__init__(
+            model=model,
+            stream=stream,
+            cache=cache,
+            keep_alive=keep_alive,
+            structured=structured,
+            pool=pool or BackendPool(base_urls or [base_url]),
+            hedge_after=hedge_after,
+            telemetry=telemetry,
+            prompt_eval=prompt_eval,
+        )
+        self._timeout = timeout
+        self._http = httpx.AsyncClient(
+            timeout=timeout,
+            limits=_limits(
+                max_connections, max_keepalive_connections, keepalive_expiry
+            ),
+        )
+
+    async def aclose(self) -> None:
+        """
+        Release pooled connections.
+        """
+        await self._http.aclose()
+
+    async def __aenter__(self) -> AsyncLLMClient:
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
+
+    async def _send(self, backend: Backend, payload: dict) -> httpx.Response:
+        with self._pool.track(backend):
+            resp = await self._http.post(backend.generate_url, json=payload)
+            resp.raise_for_status()
+            return resp
+
+    async def _post(self, payload: dict) -> httpx.Response:
+        if self._hedging():
+            return await self._post_hedged(payload)
+        return await self._post_failover(payload)
+
+    async def _post_failover(
+        self, payload: dict, exclude: Iterable[str] = ()
+    ) -> httpx.Response:
+        error: Optional[BaseException] = None
+
+        for backend in self._pool.candidates(exclude):
+            try:
+                return await self._send(backend, payload)
+            except Exception as e:
+                if not retryable(e):
+                    raise
+                error = e
+
+        raise error or LLMError("No Ollama backend available")
+
+    async def _post_hedged(self, payload: dict) -> httpx.Response:
+        primary = self._pool.select()
+        first = asyncio.create_task(self._send(primary, payload))
+
+        done, _ = await asyncio.wait({first}, timeout=self._hedge_after)
+        if done:
+            try:
+                return first.result()
+            except Exception as e:
+                if not retryable(e):
+                    raise
+                return await self._post_failover(payload, exclude=[primary.url])
+
+        secondary = self._pool.select(exclude=[primary.url])
+        pending = {first, asyncio.create_task(self._send(secondary, payload))}
+        error: Optional[BaseException] = None
+
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+        finally:
+            for task in pending:
+                task.cancel()
+
+        raise error
+
+    async def warm(self, prefix: str = "") -> None:
+        """
+        Load the model (and evaluate the static prefix) on every
+        backend ahead of the first turn. Best effort.
+        """
+        payload = self._warm_payload(prefix)
+
+        responses = await asyncio.gather(
+            *(self._send(backend, payload) for backend in self._pool.backends),
+            return_exceptions=True,
+        )
+        for resp in responses:
+            if isinstance(resp, httpx.Response):
+                try:
+                    self.prompt_eval.record_cold(
+                        payload["system"], payload["prompt"], resp.json()
+                    )
+                except ValueError:
+                    pass
+
+    async def generate(
+        self,
+        user_input: str,
+        schema: LLMRequest,
+        context: str,
+        prefix: str = "",
+        kind: LLMCallKind = LLMCallKind.GENERATE,
+    ) -> BaseModel:
+        """
+        Convert user input into a structured request.
+
+        Raises:
+            LLMError
+        """
+        payload = self._generate_payload(user_input, context, schema, prefix)
+        adapter = adapter_for(schema)
+
+        cached = self._cached_request(payload, adapter)
+        if cached is not None:
+            return cached
+
+        with self._track_call(kind) as call:
+            if self._stream and self._hedging():
+                result = await self._generate_streaming_hedged(
+                    call, payload, adapter
+                )
+            elif self._stream:
+                result = await self._generate_streaming(call, payload, adapter)
+            else:
+                result = await self._generate_blocking(call, payload, adapter)
+
+        return self._store_request(payload, adapter, result)
+
+    async def _generate_blocking(
+        self, call: LLMCall, payload: dict, adapter: TypeAdapter
+    ) -> BaseModel:
+        try:
+            resp = await self._post(payload)
+        except Exception as e:
+            raise LLMError(f"Ollama execution failed: {e}") from e
+
+        data = self._receive(call, payload, resp)
+        return self._parse_response(data, adapter)
+
+    async def _generate_streaming(
+        self,
+        call: LLMCall,
+        payload: dict,
+        adapter: TypeAdapter,
+        exclude: Iterable[str] = (),
+    ) -> BaseModel:
+        error: Optional[BaseException] = None
+
+        for backend in self._pool.candidates(exclude):
+            decoder = IncrementalJSONDecoder()
+            call.backend = backend.url
+
+            try:
+                with self._pool.track(backend):
+                    async with self._http.stream(
+                        "POST", backend.generate_url, json=payload
+                    ) as resp:
+                        resp.raise_for_status()
+
+                        async for line in resp.aiter_lines():
+                            result, finished = self._consume_stream_line(
+                                call, payload, line, decoder, adapter
+                            )
+                            if result is not None:
+                                return result
+                            if finished:
+                                break
+            except Exception as e:
+                if decoder.text or not retryable(e):
+                    raise LLMError(f"Ollama execution failed: {e}") from e
+                error = e
+            else:
+                return self._finish_stream(decoder, adapter)
+
+        raise LLMError(f"Ollama execution failed: {error}") from error
+
+    async def _generate_streaming_hedged(
+        self, call: LLMCall, payload: dict, adapter: TypeAdapter
+    ) -> BaseModel:
+        primary = self._pool.select()
+        first = asyncio.create_task(self._open_stream(primary, payload))
+
+        done, _ = await asyncio.wait({first}, timeout=self._hedge_after)
+        if done and first.exception() is not None:
+            e = first.exception()
+            if not retryable(e):
+                raise LLMError(f"Ollama execution failed: {e}") from e
+            return await self._generate_streaming(
+                call, payload, adapter, exclude=[primary.url]
+            )
+
+        winner = first.result() if done else None
+        secondary = self._pool.select(exclude=[primary.url])
+        if winner is None and secondary is None:
+            try:
+                winner = await first
+            except Exception as e:
+                raise LLMError(f"Ollama execution failed: {e}") from e
+        elif winner is None:
+            pending = {
+                first,
+                asyncio.create_task(self._open_stream(secondary, payload)),
+            }
+            error: Optional[BaseException] = None
+
+            try:
+                while pending and winner is None:
+                    done, pending = await asyncio.wait(
+                        pending, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    for task in done:
+                        if task.exception() is not None:
+                            error = task.exception()
+                        elif winner is None:
+                            winner = task.result()
+                        else:
+                            await task.result()[1].aclose()
+            finally:
+                for task in pending:
+                    task.cancel()
+
+            if winner is None:
+                raise LLMError(f"Ollama execution failed: {error}") from error
+
+        backend, stack, lines = winner
+        decoder = IncrementalJSONDecoder()
+        call.backend = backend.url
 
         try:
-            resp = httpx.post(self._url, json=payload, timeout=self._timeout)
+            async with stack:
+                async for line in lines:
+                    result, finished = self._consume_stream_line(
+                        call, payload, line, decoder, adapter
+                    )
+                    if result is not None:
+                        return result
+                    if finished:
+                        break
+        except Exception as e:
+            raise LLMError(f"Ollama execution failed: {e}") from e
+
+        return self._finish_stream(decoder, adapter)
+
+    async def _open_stream(
+        self, backend: Backend, payload: dict
+    ) -> Tuple[Backend, AsyncExitStack, AsyncIterator[str]]:
+        stack = AsyncExitStack()
+        try:
+            stack.enter_context(self._pool.track(backend))
+            resp = await stack.enter_async_context(
+                self._http.stream("POST", backend.generate_url, json=payload)
+            )
             resp.raise_for_status()
-            data = resp.json()
-            return data.get("response", "").strip()
+            lines = resp.aiter_lines()
+            first = await anext(lines, "")
+        except BaseException as e:
+            await stack.__aexit__(type(e), e, e.__traceback__)
+            raise
+
+        return backend, stack, _prepend(first, lines)
+
+    async def extract_facts(self, user_input: str, output: str) -> list[str]:
+        return await self.extract_facts_batch([(user_input, output)])
+
+    async def extract_facts_batch(
+        self, turns: Iterable[Tuple[str, str]]
+    ) -> list[str]:
+        payload = self._facts_payload(turns)
+
+        try:
+            cached = self._cache_get(payload)
+            if cached is not None:
+                return self._parse_facts(cached)
+
+            with self._track_call(LLMCallKind.EXTRACT_FACTS) as call:
+                resp = await self._post(payload)
+                data = self._receive(call, payload, resp)
+            raw = data.get("response", "{}")
+            facts = self._parse_facts(raw)
+            self._cache_put(payload, raw)
+            return facts
+        except Exception:
+            return []
+
+    async def generate_text(self, prompt: str) -> str:
+        payload = self._text_payload(prompt)
+
+        cached = self._cache_get(payload)
+        if cached is not None:
+            return cached
+
+        try:
+            with self._track_call(LLMCallKind.GENERATE_TEXT) as call:
+                resp = await self._post(payload)
+                data = self._receive(call, payload, resp)
+            text = data.get("response", "").strip()
         except Exception as e:
             raise LLMError(f"Ollama execution failed: {e}") from e
+
+        self._cache_put(payload, text)
+        return text
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Optional, Sequence
+
+import httpx
+
+from el.config.consts import (
+    LLM_BACKEND_RETRY_AFTER,
+    LLM_HEALTH_INTERVAL,
+    LLM_HEALTH_TIMEOUT,
+)
+
+# Weight of the newest sample in the latency moving average.
+_EWMA_ALPHA = 0.3
+
+
+def retryable(error: BaseException) -> bool:
+    """
+    Whether a failed request may be retried on another backend.
+    Connection problems and server-side errors are; bad requests
+    are not, since every backend would reject them.
+    """
+    if isinstance(error, httpx.TransportError):
+        return True
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code >= 500
+    return False
+
+
+@dataclass
+class Backend:
+    """
+    One Ollama endpoint and what the pool knows about it.
+    """
+
+    url: str
+    healthy: bool = True
+    in_flight: int = 0
+    latency: Optional[float] = None
+    failures: int = 0
+    retry_at: float = 0.0
+
+    @property
+    def generate_url(self) -> str:
+        return f"{self.url}/api/generate"
+
+
+class BackendPool:
+    """
+    Health-checked pool of Ollama endpoints.
+
+    Responsibilities:
+    - Order backends for a request: healthy first, then fewest
+      in-flight requests, then lowest measured latency
+    - Take failing backends out of rotation and let them back in
+      after a cool-down (or a passing health check)
+    - Optionally probe every backend in a background thread
+    """
+
+    def __init__(
+        self,
+        urls: Sequence[str],
+        retry_after: float = LLM_BACKEND_RETRY_AFTER,
+        health_timeout: float = LLM_HEALTH_TIMEOUT,
+    ) -> None:
+        if not urls:
+            raise ValueError("At least one Ollama backend is required")
+
+        self._backends = [Backend(url=u.rstrip("/")) for u in urls]
+        self._retry_after = retry_after
+        self._health_timeout = health_timeout
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __len__(self) -> int:
+        return len(self._backends)
+
+    @property
+    def backends(self) -> List[Backend]:
+        return list(self._backends)
+
+    def candidates(self, exclude: Iterable[str] = ()) -> List[Backend]:
+        """
+        Backends in the order they should be tried.
+
+        Backends that are down are still returned, last, so that a
+        request is attempted even when every backend looks unhealthy.
+        """
+        excluded = set(exclude)
+        now = time.monotonic()
+
+        with self._lock:
+            pool = [b for b in self._backends if b.url not in excluded]
+            return sorted(
+                pool,
+                key=lambda b: (
+                    not (b.healthy or now >= b.retry_at),
+                    b.in_flight,
+                    b.latency if b.latency is not None else float("inf"),
+                ),
+            )
+
+    def select(self, exclude: Iterable[str] = ()) -> Optional[Backend]:
+        candidates = self.candidates(exclude)
+        return candidates[0] if candidates else None
+
+    @contextmanager
+    def track(self, backend: Backend) -> Iterator[Backend]:
+        """
+        Account a request against backend for load balancing and
+        passive health checking.
+        """
+        with self._lock:
+            backend.in_flight += 1
+
+        try:
+            yield backend
+        except BaseException as e:
+            if retryable(e):
+                self.mark_failed(backend)
+            raise
+        else:
+            self.mark_healthy(backend)
+        finally:
+            with self._lock:
+                backend.in_flight -= 1
+
+    def mark_failed(self, backend: Backend) -> None:
+        with self._lock:
+            backend.healthy = False
+            backend.failures += 1
+            backend.retry_at = time.monotonic() + self._retry_after
+
+    def mark_healthy(self, backend: Backend, latency: Optional[float] = None) -> None:
+        with self._lock:
+            backend.healthy = True
+            backend.failures = 0
+            if latency is not None:
+                if backend.latency is None:
+                    backend.latency = latency
+                else:
+                    backend.latency += _EWMA_ALPHA * (latency - backend.latency)
+
+    def check(self) -> None:
+        """
+        Probe every backend once.
+        """
+        with httpx.Client(timeout=self._health_timeout) as http:
+            for backend in self.backends:
+                started = time.perf_counter()
+                try:
+                    http.get(f"{backend.url}/api/version").raise_for_status()
+                except Exception:
+                    self.mark_failed(backend)
+                else:
+                    self.mark_healthy(backend, time.perf_counter() - started)
+
+    def start(self, interval: float = LLM_HEALTH_INTERVAL) -> None:
+        """
+        Run check() every interval seconds in a daemon thread.
+        """
+        if self._thread is not None:
+            return
+
+        def run() -> None:
+            while not self._stop.is_set():
+                self.check()
+                self._stop.wait(interval)
+
+        self._thread = threading.Thread(
+            target=run, name="el-backend-health", daemon=True
+        )
+        self._thread.start()
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(self._health_timeout * len(self._backends) + 1)
+            self._thread = None
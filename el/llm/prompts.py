@@ -16,12 +16,26 @@ For shell actions:
   {"action": "shell", "command": ["ls", "-la"]}
 """
 
+# Used with schema-constrained decoding: the output shape is enforced
+# by the JSON Schema passed as Ollama's format, so the prose about
+# JSON syntax and examples is dropped.
+STRUCTURED_SYSTEM_PROMPT = """
+You are el, a local system assistant.
+
+Rules:
+- Choose exactly ONE action
+- Never invent commands or arguments
+- If no action clearly applies, choose "noop"
+"""
+
 SUMMARY_PROMPT = """
 You are a system that extracts durable FACTS.
 
 Rules:
 - Summarize ONLY factual, reusable knowledge
 - Ignore commands, timestamps, noise
+- If a previous summary is given, merge the new commands into it
+  and return the complete updated summary
 - Output plain text
 - No explanations
 """
@@ -59,3 +73,22 @@ Schema:
   ]
 }
 """
+
+STRUCTURED_PLANNER_PROMPT = """
+You are el's planner.
+
+Your job:
+- Decompose the user's request into an ordered plan.
+- Do NOT execute anything.
+- Return steps using ONLY supported agent actions.
+
+Supported actions:
+- shell
+- port_inspect
+
+Rules:
+- Always return a plan, even if trivial
+- Steps MUST directly contribute to the goal
+- Do NOT add history, noop, or meta actions unless explicitly requested
+- Use ONLY actions needed to achieve the goal
+"""
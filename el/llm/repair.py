@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import ast
+import copy
+import json
+import re
+from functools import lru_cache
+from typing import Any, Optional
+
+from pydantic import TypeAdapter, ValidationError
+
+_FENCE = re.compile(r"```(?:json|JSON)?\s*(.*?)\s*```", re.DOTALL)
+_TRAILING_COMMA = re.compile(r",\s*([}\]])")
+
+
+@lru_cache(maxsize=None)
+def adapter_for(schema: Any) -> TypeAdapter:
+    """
+    Build (once) the validator for a schema.
+    """
+    return TypeAdapter(schema)
+
+
+def repair_json(raw: str | bytes) -> Optional[Any]:
+    """
+    Recover a JSON value from common LLM output defects:
+    code fences, leading/trailing prose, single quotes,
+    Python literals and trailing commas.
+
+    Returns:
+        The decoded value, or None if it cannot be recovered.
+    """
+    text = raw.decode("utf-8", errors="replace") if isinstance(raw, bytes) else raw
+
+    fenced = _FENCE.search(text)
+    if fenced:
+        text = fenced.group(1)
+
+    candidate = _balanced(text)
+    if candidate is None:
+        return None
+
+    for attempt in (candidate, _TRAILING_COMMA.sub(r"\1", candidate)):
+        try:
+            return json.loads(attempt)
+        except json.JSONDecodeError:
+            pass
+
+    try:
+        # Single-quoted keys/strings, True/False/None, trailing commas.
+        return ast.literal_eval(candidate)
+    except (ValueError, SyntaxError, MemoryError, RecursionError):
+        return None
+
+
+def coerce_lists(value: Any, error: ValidationError) -> Optional[Any]:
+    """
+    Wrap strings that the schema expected to be lists.
+
+    Returns:
+        A corrected copy of value, or None if nothing was fixed.
+    """
+    fixed = copy.deepcopy(value)
+    changed = False
+
+    for err in error.errors():
+        if err["type"] != "list_type" or not isinstance(err["input"], str):
+            continue
+
+        parent, key = _locate(fixed, err["loc"])
+        if parent is not None and parent[key] == err["input"]:
+            parent[key] = [err["input"]]
+            changed = True
+
+    return fixed if changed else None
+
+
+def _locate(value: Any, loc: tuple) -> tuple[Any, Any]:
+    """
+    Follow a validation error location into value.
+
+    Union errors interleave member tags (e.g. "ShellLLMRequest")
+    with real keys; anything that is not a key is skipped.
+    """
+    parent, key = None, None
+    current = value
+
+    for part in loc:
+        if isinstance(current, dict) and part in current:
+            parent, key = current, part
+        elif (
+            isinstance(current, list)
+            and isinstance(part, int)
+            and 0 <= part < len(current)
+        ):
+            parent, key = current, part
+        else:
+            continue
+        current = parent[key]
+
+    return parent, key
+
+
+def _balanced(text: str) -> Optional[str]:
+    """
+    Extract the first balanced {...} or [...] from text,
+    dropping anything before or after it.
+    """
+    start = None
+    depth = 0
+    quote = None
+    escape = False
+
+    for i, ch in enumerate(text):
+        if start is None:
+            if ch in "{[":
+                start = i
+                depth = 1
+            continue
+
+        if quote:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == quote:
+                quote = None
+            continue
+
+        if ch in "\"'":
+            quote = ch
+        elif ch in "{[":
+            depth += 1
+        elif ch in "}]":
+            depth -= 1
+            if depth == 0:
+                return text[start : i + 1]
+
+    return None
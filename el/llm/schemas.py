@@ -1,6 +1,10 @@
-from typing import List, Literal, Union
+import shlex
+from functools import lru_cache
+from typing import Any, List, Literal, Union
 from pydantic import BaseModel, Field, field_validator
 
+from el.llm.repair import adapter_for
+
 
 class NoOpRequest(BaseModel):
     action: Literal["noop"]
@@ -14,7 +18,10 @@ class ShellLLMRequest(BaseModel):
     @classmethod
     def coerce_command(cls, v):
         if isinstance(v, str):
-            return [v]
+            try:
+                return shlex.split(v) or [v]
+            except ValueError:
+                return [v]
         return v
 
 
@@ -29,3 +36,26 @@ class FactExtractionRequest(BaseModel):
 
 # This is the union the LLM is allowed to emit
 LLMRequest = Union[NoOpRequest, ShellLLMRequest, PortLLMRequest]
+
+
+def _strip_titles(node: Any) -> Any:
+    if isinstance(node, dict):
+        return {
+            k: _strip_titles(v)
+            for k, v in node.items()
+            if not (k == "title" and isinstance(v, str))
+        }
+    if isinstance(node, list):
+        return [_strip_titles(v) for v in node]
+    return node
+
+
+@lru_cache(maxsize=None)
+def format_schema(schema: Any) -> dict:
+    """
+    JSON Schema for Ollama's structured-output format.
+
+    Titles are dropped; they cost prompt tokens and do not
+    constrain decoding.
+    """
+    return _strip_titles(adapter_for(schema).json_schema())
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Optional
+
+
+class IncrementalJSONDecoder:
+    """
+    Incremental scanner for a single streamed JSON object.
+
+    Tracks string/escape state and nesting depth while tokens arrive,
+    so that at any point the prefix ending on the last complete
+    top-level member can be closed and decoded without waiting
+    for the rest of the stream.
+    """
+
+    def __init__(self) -> None:
+        self._text = ""
+        self._pos = 0
+        self._start: Optional[int] = None
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._member_end: Optional[int] = None
+        self._end: Optional[int] = None
+
+    @property
+    def text(self) -> str:
+        return self._text
+
+    @property
+    def complete(self) -> bool:
+        return self._end is not None
+
+    def feed(self, chunk: str) -> bool:
+        """
+        Consume a chunk of streamed text.
+
+        Returns:
+            True if a new top-level member (or the whole object)
+            was completed by this chunk.
+        """
+        if self.complete:
+            return False
+
+        self._text += chunk
+        progressed = False
+
+        while self._pos < len(self._text):
+            ch = self._text[self._pos]
+            self._pos += 1
+
+            if self._start is None:
+                if ch == "{":
+                    self._start = self._pos - 1
+                    self._depth = 1
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+
+            if ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._end = self._pos
+                    return True
+            elif ch == "," and self._depth == 1:
+                self._member_end = self._pos - 1
+                progressed = True
+
+        return progressed
+
+    @property
+    def raw(self) -> str:
+        """
+        The object text if complete, otherwise everything received.
+        """
+        if self._start is None or self._end is None:
+            return self._text
+        return self._text[self._start : self._end]
+
+    def partial_text(self) -> Optional[str]:
+        """
+        The object as it stands, as JSON text: either the complete
+        object, or every top-level member seen so far, closed.
+        """
+        if self._start is None:
+            return None
+
+        if self._end is not None:
+            return self.raw
+
+        if self._member_end is None:
+            return None
+
+        return self._text[self._start : self._member_end] + "}"
+
+    def partial(self) -> Optional[dict[str, Any]]:
+        """
+        Decode partial_text().
+        """
+        text = self.partial_text()
+        if text is None:
+            return None
+
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError:
+            return None
+
+    def value(self) -> Any:
+        """
+        Decode the complete object, ignoring any trailing tokens.
+
+        Raises:
+            json.JSONDecodeError
+        """
+        if self._start is None or self._end is None:
+            return json.loads(self._text)
+        return json.loads(self._text[self._start : self._end])
@@ -0,0 +1,320 @@
+from __future__ import annotations
+
+import atexit
+import queue
+import sqlite3
+import threading
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from el.config.consts import (
+    LLM_TELEMETRY_MAX_ROWS,
+    LLM_TELEMETRY_PRUNE_INTERVAL,
+    LLM_TELEMETRY_WINDOW,
+)
+from el.config.utils import percentile
+
+
+class LLMCallKind(str, Enum):
+    GENERATE = "generate"
+    EXTRACT_FACTS = "extract_facts"
+    GENERATE_TEXT = "generate_text"
+    PLAN = "plan"
+
+
+@dataclass
+class LLMCall:
+    """
+    One LLM call while it is in progress.
+
+    Filled in by the client: backend once a response arrives,
+    data with the final Ollama response object (absent when a
+    stream is cut short).
+    """
+
+    kind: LLMCallKind
+    model: str
+    backend: Optional[str] = None
+    data: Optional[Dict[str, Any]] = None
+
+
+@dataclass(frozen=True)
+class LLMCallRecord:
+    """
+    A recorded call. Durations are Ollama's, in nanoseconds;
+    latency_ms is measured by the client.
+    """
+
+    timestamp: str
+    kind: str
+    model: str
+    backend: Optional[str]
+    success: bool
+    latency_ms: float
+    total_duration: Optional[int]
+    load_duration: Optional[int]
+    prompt_eval_count: Optional[int]
+    prompt_eval_duration: Optional[int]
+    eval_count: Optional[int]
+    eval_duration: Optional[int]
+
+
+@dataclass(frozen=True)
+class LLMCallSummary:
+    kind: str
+    calls: int
+    failures: int
+    p50_ms: float
+    p95_ms: float
+    tokens_per_sec: Optional[float]
+
+
+class LLMTelemetry:
+    """
+    Persists per-call LLM performance data to SQLite.
+
+    Responsibilities:
+    - Record wall-clock latency and Ollama's timing/token fields
+      for every LLM call that reached a backend
+    - Keep recording off the response path: record() only queues the
+      row; a background thread writes it, best effort
+    - Report latency percentiles and generation throughput per call kind
+    - Keep only the newest max_rows calls, so the table does not grow
+      the log database it shares without bound
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        max_rows: int = LLM_TELEMETRY_MAX_ROWS,
+        prune_interval: int = LLM_TELEMETRY_PRUNE_INTERVAL,
+    ) -> None:
+        self._db_path = db_path
+        self._max_rows = max_rows
+        self._prune_interval = prune_interval
+        self._written = 0
+        self._queue: queue.Queue[Optional[Tuple]] = queue.Queue()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._init_db()
+
+        self._thread = threading.Thread(
+            target=self._run,
+            name="el-telemetry-writer",
+            daemon=True,
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _init_db(self) -> None:
+        """
+        Creates the telemetry table
+        """
+        with self._lock, self._conn as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS llm_calls (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    model TEXT NOT NULL,
+                    backend TEXT,
+                    success INTEGER NOT NULL,
+                    latency_ms REAL NOT NULL,
+                    total_duration INTEGER,
+                    load_duration INTEGER,
+                    prompt_eval_count INTEGER,
+                    prompt_eval_duration INTEGER,
+                    eval_count INTEGER,
+                    eval_duration INTEGER
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_llm_calls_kind "
+                "ON llm_calls (kind, id)"
+            )
+
+    def record(self, call: LLMCall, latency_ms: float, success: bool) -> None:
+        """
+        Queues the call for the table. Never blocks.
+        """
+        data = call.data or {}
+
+        self._queue.put(
+            (
+                datetime.utcnow().isoformat(),
+                call.kind.value,
+                call.model,
+                call.backend,
+                int(success),
+                latency_ms,
+                data.get("total_duration"),
+                data.get("load_duration"),
+                data.get("prompt_eval_count"),
+                data.get("prompt_eval_duration"),
+                data.get("eval_count"),
+                data.get("eval_duration"),
+            )
+        )
+
+    def flush(self) -> None:
+        """
+        Block until every recorded call is on disk.
+        """
+        self._queue.join()
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Write pending rows, stop the writer and close the connection.
+        """
+        atexit.unregister(self.close)
+        if not self._thread.is_alive():
+            return
+        self._queue.put(None)
+        self._thread.join(timeout)
+        with self._lock:
+            self._conn.close()
+
+    def _run(self) -> None:
+        stopping = False
+
+        while not stopping:
+            batch = [self._queue.get()]
+            while batch[-1] is not None:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stopping = batch[-1] is None
+            rows = [row for row in batch if row is not None]
+
+            try:
+                if rows:
+                    self._write(rows)
+            except sqlite3.Error:
+                # Telemetry is best effort: a locked or broken database
+                # loses rows, never a model answer.
+                pass
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _write(self, rows: List[Tuple]) -> None:
+        with self._lock, self._conn as conn:
+            conn.executemany(
+                """
+                INSERT INTO llm_calls (
+                    timestamp,
+                    kind,
+                    model,
+                    backend,
+                    success,
+                    latency_ms,
+                    total_duration,
+                    load_duration,
+                    prompt_eval_count,
+                    prompt_eval_duration,
+                    eval_count,
+                    eval_duration
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                rows,
+            )
+
+            self._written += len(rows)
+            if self._written >= self._prune_interval:
+                self._written = 0
+                self._prune(conn)
+
+    def prune(self) -> int:
+        """
+        Drop all but the newest max_rows calls now.
+
+        Returns:
+            The number of calls removed
+        """
+        self.flush()
+        with self._lock, self._conn as conn:
+            return self._prune(conn)
+
+    def _prune(self, conn: sqlite3.Connection) -> int:
+        """
+        Caller holds the lock.
+        """
+        return conn.execute(
+            """
+            DELETE FROM llm_calls
+            WHERE id <= (
+                SELECT id FROM llm_calls ORDER BY id DESC LIMIT 1 OFFSET ?
+            )
+            """,
+            (self._max_rows,),
+        ).rowcount
+
+    def fetch_recent(self, limit: int = LLM_TELEMETRY_WINDOW) -> List[LLMCallRecord]:
+        self.flush()
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT timestamp, kind, model, backend, success, latency_ms,
+                       total_duration, load_duration,
+                       prompt_eval_count, prompt_eval_duration,
+                       eval_count, eval_duration
+                FROM llm_calls
+                ORDER BY id DESC
+                LIMIT ?
+                """,
+                (limit,),
+            ).fetchall()
+        return [LLMCallRecord(*row[:4], bool(row[4]), *row[5:]) for row in rows]
+
+    def summary(self, window: int = LLM_TELEMETRY_WINDOW) -> List[LLMCallSummary]:
+        """
+        Latency percentiles and tokens/sec over the last window
+        calls of each kind.
+        """
+        self.flush()
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT kind, success, latency_ms, eval_count, eval_duration
+                FROM (
+                    SELECT *, ROW_NUMBER() OVER (
+                        PARTITION BY kind ORDER BY id DESC
+                    ) AS n
+                    FROM llm_calls
+                )
+                WHERE n <= ?
+                """,
+                (window,),
+            ).fetchall()
+
+        by_kind: Dict[str, list] = defaultdict(list)
+        for kind, *rest in rows:
+            by_kind[kind].append(rest)
+
+        return [
+            self._summarize(kind, by_kind[kind]) for kind in sorted(by_kind)
+        ]
+
+    @staticmethod
+    def _summarize(kind: str, rows: list) -> LLMCallSummary:
+        latencies = sorted(latency for _, latency, _, _ in rows)
+        tokens = sum(count for _, _, count, ns in rows if count and ns)
+        eval_ns = sum(ns for _, _, count, ns in rows if count and ns)
+
+        return LLMCallSummary(
+            kind=kind,
+            calls=len(rows),
+            failures=sum(1 for success, *_ in rows if not success),
+            p50_ms=percentile(latencies, 50),
+            p95_ms=percentile(latencies, 95),
+            tokens_per_sec=tokens / (eval_ns / 1e9) if eval_ns else None,
+        )
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+
+from el.config.consts import CHARS_PER_TOKEN
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Cheap, model-agnostic token estimate.
+    """
+    if not text:
+        return 0
+    return max(1, -(-len(text) // CHARS_PER_TOKEN))
+
+
+@dataclass(frozen=True)
+class PromptEval:
+    """
+    Prompt evaluation of one Ollama call, in Ollama's own token counts.
+
+    prefix_tokens is what evaluating the system prefix cost on a cold
+    call (the warm-up), if one was seen. The rest of the prompt is
+    sized with the characters-per-token ratio that call measured, so
+    reused_tokens is how far evaluated_tokens fell short of prefix
+    plus rest (at most prefix_tokens; 0 when no cold call was seen).
+    """
+
+    evaluated_tokens: int
+    eval_ms: float
+    prefix_tokens: Optional[int]
+    reused_tokens: int
+    saved_ms: float
+
+
+@dataclass
+class PromptEvalStats:
+    calls: int = 0
+    evaluated_tokens: int = 0
+    reused_tokens: int = 0
+    eval_ms: float = 0.0
+    saved_ms: float = 0.0
+    last: Optional[PromptEval] = None
+    # system -> (tokens, characters) of its cold evaluation
+    _prefixes: Dict[str, Tuple[int, int]] = field(default_factory=dict, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record_cold(self, system: str, prompt: str, data: dict[str, Any]) -> None:
+        """
+        Take the prompt_eval_count of a cold call that sent system
+        with a minimal prompt as the cost of evaluating that prefix.
+        """
+        evaluated = data.get("prompt_eval_count")
+        if not evaluated:
+            return
+
+        with self._lock:
+            known = self._prefixes.get(system)
+            if known is None or evaluated > known[0]:
+                self._prefixes[system] = (evaluated, len(system) + len(prompt))
+
+    def record(
+        self, system: str, prompt: str, data: dict[str, Any]
+    ) -> Optional[PromptEval]:
+        """
+        Record the prompt-eval fields of a final Ollama response to a
+        call sending system as its prefix and prompt after it.
+        """
+        evaluated = data.get("prompt_eval_count")
+        duration_ns = data.get("prompt_eval_duration")
+        if not evaluated or duration_ns is None:
+            return None
+
+        with self._lock:
+            prefix = self._prefixes.get(system)
+
+        reused = 0
+        if prefix is not None:
+            prefix_tokens, prefix_chars = prefix
+            rest = round(len(prompt) * prefix_tokens / prefix_chars)
+            reused = min(max(prefix_tokens + rest - evaluated, 0), prefix_tokens)
+        ns_per_token = duration_ns / evaluated
+
+        sample = PromptEval(
+            evaluated_tokens=evaluated,
+            eval_ms=duration_ns / 1e6,
+            prefix_tokens=prefix[0] if prefix is not None else None,
+            reused_tokens=reused,
+            saved_ms=reused * ns_per_token / 1e6,
+        )
+
+        with self._lock:
+            self.calls += 1
+            self.evaluated_tokens += sample.evaluated_tokens
+            self.reused_tokens += sample.reused_tokens
+            self.eval_ms += sample.eval_ms
+            self.saved_ms += sample.saved_ms
+            self.last = sample
+
+        return sample
@@ -3,8 +3,10 @@ from el.cli import CLI
 
 
 def main() -> None:
-    # CLI().run(sys.argv)
-    CLI().converse()
+    if len(sys.argv) > 1:
+        CLI(interactive=False).run(sys.argv)
+    else:
+        CLI().converse()
 
 
 if __name__ == "__main__":
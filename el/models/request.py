@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 from typing import List, Literal, Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 
-from el.config.consts import HISTORY_RECORDS_LIMIT
+from el.config.consts import HISTORY_MAX_LIMIT, HISTORY_RECORDS_LIMIT
+from el.config.utils import utc_isoformat
 
 
 class BaseRequest(BaseModel):
@@ -21,7 +22,19 @@ class ShellRequest(BaseRequest):
 
 class HistoryRequest(BaseRequest):
     action: Literal["history"] = "history"
-    limit: int = Field(default=HISTORY_RECORDS_LIMIT, ge=1, le=100)
+    limit: int = Field(default=HISTORY_RECORDS_LIMIT, ge=1, le=HISTORY_MAX_LIMIT)
+    text: Optional[str] = None
+    since: Optional[str] = None  # ISO timestamp (UTC), inclusive
+    until: Optional[str] = None  # ISO timestamp (UTC), exclusive
+    return_code: Optional[int] = None
+    failed: Optional[bool] = None
+    binary: Optional[str] = None
+    before: Optional[int] = Field(default=None, ge=1)  # next_cursor of a page
+
+    @field_validator("since", "until")
+    @classmethod
+    def normalize_timestamp(cls, v):
+        return utc_isoformat(v) if v is not None else v
 
 
 class PortInspectRequest(BaseRequest):
@@ -14,9 +14,14 @@ class ShellResponse(BaseResponse):
     stdout: str
     stderr: str
     timed_out: bool
+    duration: float = 0.0
+    user_time: float = 0.0
+    sys_time: float = 0.0
+    max_rss: int = 0
 
 
 class HistoryRecord(BaseModel):
+    id: int
     timestamp: str
     command: str
     return_code: int
@@ -24,6 +29,7 @@ class HistoryRecord(BaseModel):
 
 class HistoryResponse(BaseResponse):
     records: List[HistoryRecord]
+    next_cursor: Optional[int] = None  # pass as before= for the next page
 
 
 class PortProcess(BaseModel):
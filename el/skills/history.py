@@ -1,6 +1,6 @@
-from typing import List, Tuple
+from typing import List
 
-from el.db.sqlite import SQLiteExecutionLogger
+from el.db.sqlite import ExecutionLogRecord, SQLiteExecutionLogger
 
 
 class HistorySkill:
@@ -11,5 +11,9 @@ class HistorySkill:
     def __init__(self, logger: SQLiteExecutionLogger) -> None:
         self._logger = logger
 
-    def run(self, limit: int = 10) -> List[Tuple]:
-        return self._logger.fetch_recent(limit)
+    def run(self, limit: int = 10, **filters) -> List[ExecutionLogRecord]:
+        """
+        Newest log entries matching filters (see
+        SQLiteExecutionLogger.search).
+        """
+        return self._logger.search(limit=limit, **filters)